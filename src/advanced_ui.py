@@ -389,7 +389,7 @@ class AdvancedSettingsWindow:
         ttk.Label(ocr_config_frame, text="页面分割模式:").grid(row=1, column=0, sticky=tk.W, pady=5)
         self.psm_var = tk.StringVar()
         psm_combo = ttk.Combobox(ocr_config_frame, textvariable=self.psm_var, width=20)
-        psm_combo['values'] = ("3", "6", "8", "13")
+        psm_combo['values'] = ("3", "6", "8", "11", "13")
         psm_combo.grid(row=1, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # 预处理设置
@@ -416,6 +416,12 @@ class AdvancedSettingsWindow:
         
         self.grayscale_var = tk.BooleanVar()
         ttk.Checkbutton(preprocessing_frame, text="灰度化", variable=self.grayscale_var).pack(anchor=tk.W)
+
+        self.auto_threshold_var = tk.BooleanVar()
+        ttk.Checkbutton(preprocessing_frame, text="自动二值化(Otsu)", variable=self.auto_threshold_var).pack(anchor=tk.W)
+
+        self.sauvola_var = tk.BooleanVar()
+        ttk.Checkbutton(preprocessing_frame, text="局部自适应二值化(Sauvola，适合明暗不均的截图)", variable=self.sauvola_var).pack(anchor=tk.W)
         
         self.enhance_contrast_var = tk.BooleanVar()
         ttk.Checkbutton(preprocessing_frame, text="增强对比度", variable=self.enhance_contrast_var).pack(anchor=tk.W)
@@ -552,11 +558,13 @@ class AdvancedSettingsWindow:
         # OCR设置
         ocr_config = settings.get("ocr_config", {})
         self.language_var.set(ocr_config.get("language", "chi_sim+eng"))
-        self.psm_var.set(ocr_config.get("psm", "3"))
+        self.psm_var.set(ocr_config.get("psm", "6"))
         
         # 预处理设置
         preprocessing = settings.get("preprocessing", {})
         self.grayscale_var.set(preprocessing.get("grayscale", True))
+        self.auto_threshold_var.set(preprocessing.get("auto_threshold", False))
+        self.sauvola_var.set(preprocessing.get("method", "global") == "sauvola")
         self.enhance_contrast_var.set(preprocessing.get("enhance_contrast", False))
         self.denoise_var.set(preprocessing.get("denoise", False))
         
@@ -566,14 +574,14 @@ class AdvancedSettingsWindow:
         
         # 高级设置
         self.max_workers_var.set(settings.get("max_workers", 4))
-        self.auto_save_var.set(settings.get("auto_save", True))
+        self.auto_save_var.set(settings.get("auto_save", False))
         self.smart_optimization_var.set(settings.get("smart_optimization", True))
         self.debug_mode_var.set(settings.get("debug_mode", False))
         
     def save_settings(self):
         """保存设置"""
         try:
-            settings = self.config_manager.get_all()
+            settings = self.config_manager.get_all_mutable()
             
             # 更新基础设置
             settings["tesseract_path"] = self.tesseract_path_var.get()
@@ -588,7 +596,7 @@ class AdvancedSettingsWindow:
             settings["ocr_config"] = {
                 "language": self.language_var.get(),
                 "psm": self.psm_var.get(),
-                "oem": "3"
+                "oem": settings.get("ocr_config", {}).get("oem", "1")
             }
             
             # 更新预处理配置
@@ -597,7 +605,9 @@ class AdvancedSettingsWindow:
                 "enhance_contrast": self.enhance_contrast_var.get(),
                 "denoise": self.denoise_var.get(),
                 "invert": False,
-                "threshold": 0
+                "threshold": 0,
+                "auto_threshold": self.auto_threshold_var.get(),
+                "method": "sauvola" if self.sauvola_var.get() else "global"
             }
             
             # 更新缓存配置
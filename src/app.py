@@ -2,9 +2,12 @@
 import os
 import sys
 import ctypes
+import functools
 import threading
 import time
 import json
+import queue
+from types import MappingProxyType
 import tkinter as tk
 from tkinter import messagebox, ttk
 import logging
@@ -13,9 +16,9 @@ from ocr_engine import OCREngine
 from result_window import ResultWindow
 # from settings_window import SettingsWindow  # 已替换为AdvancedSettingsWindow
 from translation import TranslationEngine
-from config import Config
+from config import Config, CaptureSnapshot
 from error_handler import ErrorHandler, error_handler_decorator
-from performance import PerformanceMonitor, time_operation
+from performance import get_monitor, time_operation
 from async_processor import AsyncProcessor, ProgressTracker
 from advanced_cache import AdvancedCache
 # from smart_ocr import SmartOCREngine  # 暂时禁用，存在NumPy兼容性问题
@@ -27,8 +30,8 @@ import keyboard
 DEFAULT_SETTINGS = {
     "ocr_config": {
         "language": "chi_sim+eng",
-        "psm": "3",
-        "oem": "3"
+        "psm": "6",
+        "oem": "1"
     },
     "offset": {
         "horizontal": 0,
@@ -50,6 +53,29 @@ DEFAULT_SETTINGS = {
 
 SETTINGS_FILE = "settings.json"
 
+# 选择层关闭到截图之间的等待时间（毫秒），仅需覆盖合成器重绘
+CAPTURE_SETTLE_MS = 50
+
+# OCR引擎后台预热期间的状态栏文本
+_WARMUP_STATUS = "正在加载OCR引擎..."
+
+# Windows API函数原型（导入时绑定一次，避免每次调用的属性查找和参数类型推断）
+if sys.platform == 'win32':
+    from ctypes import wintypes
+
+    _user32 = ctypes.WinDLL('user32', use_last_error=True)
+    _gdi32 = ctypes.WinDLL('gdi32', use_last_error=True)
+    _GetSystemMetrics = ctypes.WINFUNCTYPE(ctypes.c_int, ctypes.c_int)(("GetSystemMetrics", _user32))
+    _GetDC = ctypes.WINFUNCTYPE(wintypes.HDC, wintypes.HWND)(("GetDC", _user32))
+    _ReleaseDC = ctypes.WINFUNCTYPE(ctypes.c_int, wintypes.HWND, wintypes.HDC)(("ReleaseDC", _user32))
+    _GetDeviceCaps = ctypes.WINFUNCTYPE(ctypes.c_int, wintypes.HDC, ctypes.c_int)(("GetDeviceCaps", _gdi32))
+    try:
+        # shcore仅在Windows 8.1及以上版本可用
+        _shcore = ctypes.WinDLL('shcore', use_last_error=True)
+        _SetProcessDpiAwareness = ctypes.WINFUNCTYPE(ctypes.c_long, ctypes.c_int)(("SetProcessDpiAwareness", _shcore))
+    except (OSError, AttributeError):
+        _SetProcessDpiAwareness = None
+
 def resource_path(relative_path):
     """获取资源绝对路径，支持开发环境和PyInstaller打包环境"""
     try:
@@ -60,6 +86,11 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
+@functools.lru_cache(maxsize=None)
+def _path_ok(path):
+    """缓存路径存在性检查（路径位于网络驱动器时stat可能阻塞数秒），保存设置时清空"""
+    return os.path.exists(path)
+
 class OCRApplication:
     """主应用程序类"""
 
@@ -74,8 +105,8 @@ class OCRApplication:
         # 应用程序初始化开始
 
         # 初始化优化组件
-        self.error_handler = ErrorHandler()
-        self.performance_monitor = PerformanceMonitor()
+        self.error_handler = ErrorHandler(tk_root=self.master)
+        self.performance_monitor = get_monitor()
         self.async_processor = AsyncProcessor(max_workers=6)
         self.progress_tracker = ProgressTracker()
         
@@ -90,7 +121,8 @@ class OCRApplication:
         
         # 配置管理
         self.config = Config()
-        self.settings = self.config.get_all()
+        # 应用持有独立的可修改副本：OCR引擎会直接修改其中的ocr_config/preprocessing
+        self._set_settings(self.config.get_all_mutable())
 
         # 获取系统信息
         self.dpi_scale = self.get_dpi_scaling()
@@ -120,8 +152,9 @@ class OCRApplication:
         )
 
         # 设置Tesseract路径
-        pytesseract.pytesseract.tesseract_cmd = self.settings["tesseract_path"]
-        if os.path.exists(self.settings["tessdata_path"]):
+        pytesseract.pytesseract.tesseract_cmd = (self.config.resolved_tesseract_path(self.settings["tesseract_path"])
+                                                 or self.settings["tesseract_path"])
+        if _path_ok(self.settings["tessdata_path"]):
             os.environ['TESSDATA_PREFIX'] = self.settings["tessdata_path"]
 
         self.result_window = None
@@ -136,6 +169,16 @@ class OCRApplication:
         self.hotkey_enabled = True
         self.hotkey_thread = None
 
+        # OCR引擎预热结果：None 进行中，True 成功，False 失败（工作线程写入，主线程轮询显示）
+        self._ocr_warm = None
+
+        # 识别结果后台写盘队列（首次自动保存时创建）
+        self._save_queue = None
+
+        # 尚未显示的OCR进度（百分比, 描述），由主线程合并刷新
+        self._pending_progress = None
+        self._progress_lock = threading.Lock()
+
         # 创建界面
         self.create_main_ui()
         self.check_paths()
@@ -146,13 +189,47 @@ class OCRApplication:
             if os.path.exists(icon_path):
                 self.master.iconbitmap(icon_path)
         except Exception as e:
-            self.logger.error(f"设置应用图标失败: {str(e)}")
+            self.logger.error("设置应用图标失败: %s", e)
 
         # 启动快捷键监听
         self.start_hotkey_listener()
 
+        # 后台预热OCR引擎，避免首次截图时加载Tesseract造成卡顿
+        self.status_var.set(_WARMUP_STATUS)
+        self.async_processor.submit_task("ocr_warmup", self._warmup_ocr)
+        self.master.after(100, self._poll_warmup)
+
         # OCR应用程序已启动
 
+    def _warmup_ocr(self):
+        """预热OCR引擎（后台线程执行）"""
+        try:
+            self.ocr_engine.warmup()
+            self._ocr_warm = True
+        except Exception as e:
+            self.logger.warning("OCR引擎预热失败: %s", e)
+            self._ocr_warm = False
+
+    def _poll_warmup(self):
+        """主线程轮询预热结果并显示在状态栏"""
+        if self._ocr_warm is None:
+            self.master.after(100, self._poll_warmup)
+            return
+        # 用户已开始截图等操作时不覆盖其状态
+        if self.status_var.get() == _WARMUP_STATUS:
+            self.status_var.set("就绪：OCR引擎已加载" if self._ocr_warm else "就绪（OCR引擎预热失败，首次识别可能较慢）")
+
+    def _set_settings(self, settings):
+        """替换当前设置快照
+
+        self.settings 是只读视图，OCR线程和快捷键线程可直接共享读取；
+        写入时构建新字典并整体重新绑定，不会与读取方竞争。
+        """
+        self._settings_raw = dict(settings)
+        self.settings = MappingProxyType(self._settings_raw)
+        # 截图流程读取的快照与 self.settings 同步重建，保证两者始终一致
+        self.capture_snapshot = CaptureSnapshot.from_settings(self._settings_raw)
+
     def start_hotkey_listener(self):
         """启动快捷键监听线程"""
         if self.hotkey_thread and self.hotkey_thread.is_alive():
@@ -178,7 +255,7 @@ class OCRApplication:
                     time.sleep(0.5)
                 time.sleep(0.05)
             except Exception as e:
-                self.logger.error(f"快捷键监听错误: {str(e)}")
+                self.logger.error("快捷键监听错误: %s", e)
                 time.sleep(1)
 
     def load_settings(self):
@@ -189,7 +266,7 @@ class OCRApplication:
                     settings = json.load(f)
                 return settings
             except Exception as e:
-                self.logger.error(f"加载设置文件失败: {str(e)}, 使用默认设置")
+                self.logger.error("加载设置文件失败: %s, 使用默认设置", e)
                 # 文件损坏时使用默认设置
                 return DEFAULT_SETTINGS
         return DEFAULT_SETTINGS
@@ -197,16 +274,18 @@ class OCRApplication:
     def save_settings(self):
         """保存设置到文件"""
         try:
+            new_settings = dict(self._settings_raw)
             # 更新OCR配置
-            self.settings["ocr_config"] = self.ocr_engine.config
+            new_settings["ocr_config"] = self.ocr_engine.config
             # 更新预处理配置
-            self.settings["preprocessing"] = self.ocr_engine.preprocessing
+            new_settings["preprocessing"] = self.ocr_engine.preprocessing
+            self._set_settings(new_settings)
 
             with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2)
+                json.dump(self._settings_raw, f, indent=2)
             return True
         except Exception as e:
-            self.logger.error(f"保存设置失败: {str(e)}")
+            self.logger.error("保存设置失败: %s", e)
             messagebox.showerror("保存设置失败", f"无法保存设置: {str(e)}")
             return False
 
@@ -214,24 +293,24 @@ class OCRApplication:
         """获取系统DPI缩放比例"""
         try:
             if sys.platform == 'win32':
-                ctypes.windll.shcore.SetProcessDpiAwareness(2)
-                hdc = ctypes.windll.user32.GetDC(0)
-                dpi_x = ctypes.windll.gdi32.GetDeviceCaps(hdc, 88)
-                ctypes.windll.user32.ReleaseDC(0, hdc)
+                if _SetProcessDpiAwareness is not None:
+                    _SetProcessDpiAwareness(2)
+                hdc = _GetDC(None)
+                dpi_x = _GetDeviceCaps(hdc, 88)  # LOGPIXELSX
+                _ReleaseDC(None, hdc)
                 return dpi_x / 96.0
         except Exception as e:
-            self.logger.warning(f"获取DPI缩放比例失败: {str(e)}")
-            return 1.0
+            self.logger.warning("获取DPI缩放比例失败: %s", e)
+        return 1.0
 
     def get_physical_screen_size(self):
         """获取物理屏幕尺寸"""
         try:
             if sys.platform == 'win32':
-                user32 = ctypes.windll.user32
-                return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
+                return _GetSystemMetrics(0), _GetSystemMetrics(1)  # SM_CXSCREEN, SM_CYSCREEN
         except Exception as e:
-            self.logger.warning(f"获取物理屏幕尺寸失败: {str(e)}")
-            return self.master.winfo_screenwidth(), self.master.winfo_screenheight()
+            self.logger.warning("获取物理屏幕尺寸失败: %s", e)
+        return self.master.winfo_screenwidth(), self.master.winfo_screenheight()
 
     def create_main_ui(self):
         """创建主界面UI"""
@@ -339,56 +418,85 @@ class OCRApplication:
         ).pack(side=tk.RIGHT, fill=tk.X, expand=True)
 
         # 使用说明
-        help_frame = ttk.LabelFrame(main_frame, text="使用说明")
-        help_frame.pack(fill=tk.BOTH, expand=True, pady=(20, 0))
-
-        instructions = [
+        self.help_frame = ttk.LabelFrame(main_frame, text="使用说明")
+        self.help_frame.pack(fill=tk.BOTH, expand=True, pady=(20, 0))
+
+        # 保存说明标签引用，快捷键变更时直接更新文本
+        self.help_labels = []
+        for instruction in self._get_instructions(self.hotkey):
+            label = ttk.Label(self.help_frame, text=instruction, anchor=tk.W)
+            label.pack(fill=tk.X, padx=10, pady=5)
+            self.help_labels.append(label)
+
+    def _get_instructions(self, hotkey):
+        """获取使用说明文本"""
+        return [
             "1. 点击'开始截图'按钮或使用快捷键截图",
             "2. 在屏幕上拖拽选择识别区域",
             "3. 查看识别结果并保存",
-            f"4. 当前截图快捷键: {self.hotkey}",
+            f"4. 当前截图快捷键: {hotkey}",
             "5. 识别完成后可手动进行翻译"
         ]
-        for instruction in instructions:
-            ttk.Label(help_frame, text=instruction, anchor=tk.W).pack(fill=tk.X, padx=10, pady=5)
 
     def check_paths(self):
-        """检查路径有效性"""
-        tesseract_path = self.settings["tesseract_path"]
+        """在后台线程检查路径有效性，结果交回主线程提示，避免阻塞界面显示"""
+        tesseract_path = (self.config.resolved_tesseract_path(self.settings["tesseract_path"])
+                          or self.settings["tesseract_path"])
         tessdata_path = self.settings["tessdata_path"]
 
-        if not os.path.exists(tesseract_path):
-            self.logger.error(f"找不到Tesseract可执行文件: {tesseract_path}")
+        # 工作线程不直接调用Tk（此时主线程可能尚未进入mainloop），结果放入队列由主线程轮询
+        results = queue.Queue(maxsize=1)
+
+        def worker():
+            results.put((tesseract_path, _path_ok(tesseract_path),
+                         tessdata_path, _path_ok(tessdata_path)))
+
+        def poll():
+            try:
+                outcome = results.get_nowait()
+            except queue.Empty:
+                self.master.after(50, poll)
+                return
+            self._report_paths(*outcome)
+
+        threading.Thread(target=worker, name="PathCheck", daemon=True).start()
+        self.master.after(50, poll)
+
+    def _report_paths(self, tesseract_path, tesseract_ok, tessdata_path, tessdata_ok):
+        """在主线程提示路径检查结果"""
+        if not tesseract_ok:
+            self.logger.error("找不到Tesseract可执行文件: %s", tesseract_path)
             messagebox.showerror("路径错误", f"找不到Tesseract可执行文件: {tesseract_path}")
-            return False
+            return
 
-        if not os.path.exists(tessdata_path):
-            self.logger.warning(f"找不到语言包目录: {tessdata_path}")
+        if not tessdata_ok:
+            self.logger.warning("找不到语言包目录: %s", tessdata_path)
             messagebox.showwarning("路径警告", f"找不到语言包目录: {tessdata_path}")
 
-        return True
-
     def start_capture(self):
         """开始截图流程"""
         self.app_status.set("状态: 准备截图")
         self.last_action.set("最近操作: 开始截图")
         self.status_var.set("准备截图...")
-        self.master.update()
+        self.master.update_idletasks()
         # 开始截图流程
         self.master.after(300, self.capture_and_ocr)
 
     def capture_and_ocr(self):
         """截图并识别文字"""
+        # 本次截图使用的配置快照（与 self.settings 来自同一份设置）
+        snap = self.capture_snapshot
+
         # 根据设置决定是否隐藏主窗口
-        if self.settings.get("hide_window_on_capture", False):
+        if snap.hide_window_on_capture:
             self.master.withdraw()  # 隐藏主窗口
-            self.master.update()  # 确保窗口状态更新
+            self.master.update_idletasks()  # 确保窗口状态更新
 
         # 选择区域
         physical_coords = self.screen_capture.select_area(self.master)
 
         # 如果隐藏了主窗口，现在恢复显示
-        if self.settings.get("hide_window_on_capture", False):
+        if snap.hide_window_on_capture:
             self.master.deiconify()  # 恢复显示主窗口
 
         if not physical_coords:
@@ -415,22 +523,25 @@ class OCRApplication:
         if y1_phys > y2_phys: y1_phys, y2_phys = y2_phys, y1_phys
 
         # 应用偏移校正
-        offset = self.settings["offset"]
-        x1_phys += offset["horizontal"]
-        y1_phys += offset["vertical"]
-        x2_phys += offset["horizontal"]
-        y2_phys += offset["vertical"]
+        x1_phys += snap.hoffset
+        y1_phys += snap.voffset
+        x2_phys += snap.hoffset
+        y2_phys += snap.voffset
 
         # 截图
         self.status_var.set(f"截取区域: ({x1:.1f}, {y1:.1f}) -> ({x2:.1f}, {y2:.1f})")
-        self.master.update()
-        time.sleep(0.3)  # 等待窗口关闭
+        self.master.update_idletasks()
+        # 选择层已销毁，等待桌面合成器重绘一两帧后再截图（不阻塞事件循环）
+        bbox = (x1_phys, y1_phys, x2_phys, y2_phys)
+        self.master.after(CAPTURE_SETTLE_MS, lambda: self._grab_and_ocr(bbox))
 
+    def _grab_and_ocr(self, bbox):
+        """截取指定区域并提交OCR任务"""
         try:
-            self.current_screenshot = self.screen_capture.capture_area((x1_phys, y1_phys, x2_phys, y2_phys))
+            self.current_screenshot = self.screen_capture.capture_area(bbox)
             # 成功截取区域
         except Exception as e:
-            self.logger.error(f"截图失败: {str(e)}")
+            self.logger.error("截图失败: %s", e)
             self.status_var.set(f"截图失败: {str(e)}")
             return
 
@@ -441,7 +552,8 @@ class OCRApplication:
         self.async_processor.submit_task(
             "ocr_task",
             self.perform_ocr,
-            callback=self._on_ocr_complete
+            # 回调在监控线程中触发，转交Tk主线程处理界面更新
+            callback=lambda result, error: self.master.after(0, self._on_ocr_complete, result, error)
         )
 
     @time_operation("OCR识别")
@@ -451,9 +563,20 @@ class OCRApplication:
         self.progress_tracker.start_progress("ocr_task", 4, "开始OCR识别")
         
         def progress_callback(percentage, description):
-            self.master.after(0, lambda: self._update_ocr_progress(percentage, description))
+            # 只保留最新进度，主线程空闲时合并刷新一次
+            with self._progress_lock:
+                pending = self._pending_progress
+                self._pending_progress = (percentage, description)
+            if pending is None:
+                self.master.after_idle(self._flush_ocr_progress)
         
         try:
+            # 并行回退识别：同时执行主语言和英文识别，延迟取两者较大值而非之和
+            if self.settings.get("parallel_ocr_fallback", False):
+                text = self._perform_parallel_ocr(progress_callback)
+                self.progress_tracker.complete_progress("ocr_task", "OCR识别完成")
+                return text
+
             # 临时禁用智能OCR，使用传统OCR引擎进行调试
             if False and self.settings.get("smart_optimization", True):
                 text = self.smart_ocr.perform_smart_ocr(self.current_screenshot, progress_callback=progress_callback)
@@ -479,6 +602,42 @@ class OCRApplication:
             self.progress_tracker.complete_progress("ocr_task", f"OCR识别失败: {str(e)}")
             raise e
     
+    def _perform_parallel_ocr(self, progress_callback):
+        """并行执行主语言识别与英文回退识别，优先返回主语言结果"""
+        # 两次识别共用同一份预处理结果
+        processed = self.ocr_engine.preprocess_image(self.current_screenshot)
+        # 本方法已运行在async_processor的工作线程中：只把英文回退识别提交到线程池，
+        # 主语言识别在当前线程直接执行，避免等待同一线程池而死锁
+        fut_eng = self.async_processor.submit(
+            self.ocr_engine.perform_ocr,
+            processed,
+            lang='eng',
+            preprocessed=True
+        )
+
+        text = self.ocr_engine.perform_ocr(
+            processed,
+            progress_callback=progress_callback,
+            preprocessed=True
+        )
+        if text.strip():
+            fut_eng.cancel()
+            return text
+
+        # 主语言结果为空，使用英文识别结果
+        self.progress_tracker.update_progress("ocr_task", 2, "尝试纯文本识别...")
+        if fut_eng.cancel():
+            # 回退任务尚未开始（如线程池已满），直接在当前线程执行
+            return self.ocr_engine.perform_ocr(processed, lang='eng', preprocessed=True)
+        return fut_eng.result()
+    
+    def _flush_ocr_progress(self):
+        """在主线程显示最近一次OCR进度"""
+        with self._progress_lock:
+            pending, self._pending_progress = self._pending_progress, None
+        if pending is not None:
+            self._update_ocr_progress(*pending)
+
     def _update_ocr_progress(self, percentage, description):
         """更新OCR进度显示"""
         if self.result_window:
@@ -486,7 +645,8 @@ class OCRApplication:
             self.result_window.text_area.delete(1.0, tk.END)
             self.result_window.text_area.insert(tk.END, f"{description} ({percentage:.0f}%)")
             self.result_window.text_area.config(state=tk.DISABLED)
-            self.result_window.window.update()
+            # 已通过after在主线程执行，只需刷新重绘任务
+            self.result_window.window.update_idletasks()
         
         # 更新主窗口状态
         self.app_status.set(f"状态: 识别中 ({percentage:.0f}%)")
@@ -526,22 +686,34 @@ class OCRApplication:
 
     
     def _save_ocr_result(self, text):
-        """保存OCR结果"""
-        try:
-            with open('ocr_result.txt', 'w', encoding='utf-8') as f:
-                f.write(text)
-            self.current_screenshot.save("screenshot.png")
-            # OCR结果和截图已保存
-        except Exception as e:
-            self.error_handler.handle_exception(e, "保存结果", show_dialog=False)
+        """保存OCR结果（需开启自动保存，写盘在后台线程完成）"""
+        if not self.settings.get("auto_save", False):
+            return
+        if self._save_queue is None:
+            self._save_queue = queue.Queue()
+            threading.Thread(target=self._save_worker, name="ResultWriter", daemon=True).start()
+        self._save_queue.put((text, self.current_screenshot))
+
+    def _save_worker(self):
+        """后台写盘线程：按顺序保存识别结果和截图"""
+        while True:
+            text, screenshot = self._save_queue.get()
+            try:
+                with open('ocr_result.txt', 'w', encoding='utf-8') as f:
+                    f.write(text)
+                # 低压缩级别：大部分体积收益，CPU开销小得多
+                screenshot.save("screenshot.png", compress_level=1)
+                # OCR结果和截图已保存
+            except Exception as e:
+                self.error_handler.handle_exception(e, "保存结果", show_dialog=False)
     
 
     def _smart_show_result_window(self):
         """智能显示结果窗口"""
         # 检查是否已有结果窗口
         if hasattr(self, 'result_window') and self.result_window and self.result_window.window.winfo_exists():
-            # 如果窗口存在，先隐藏它
-            self.result_window.window.withdraw()
+            # 销毁旧窗口，释放其持有的截图和预览图像缓冲区
+            self.result_window.on_close()
         
         # 创建新的结果窗口
         self.result_window = ResultWindow(
@@ -610,7 +782,7 @@ class OCRApplication:
             if hasattr(self, 'result_window') and self.result_window:
                 self.result_window.on_close()
         except Exception as e:
-            self.logger.warning(f"调用result_window.on_close时出现异常: {str(e)}")
+            self.logger.warning("调用result_window.on_close时出现异常: %s", e)
         
         # 更新主窗口状态
         self.last_action.set("最近操作: 结果窗口已关闭")
@@ -672,6 +844,7 @@ class OCRApplication:
             ("OCR识别次数", f"{ocr_stats.get('total_ocr_calls', 0)} 次"),
             ("识别成功率", f"{ocr_stats.get('success_count', 0)}/{ocr_stats.get('total_ocr_calls', 0)}"),
             ("平均识别时间", f"{ocr_stats.get('average_processing_time', 0):.2f} 秒"),
+            ("识别结果缓存命中", f"{ocr_stats.get('cache_hit_count', 0)} 次"),
             ("缓存命中率", f"{self.advanced_cache.get_stats().get('hit_rate', 0):.1%}"),
             ("总运行时间", f"{perf_stats.get('total_runtime', 0):.1f} 秒"),
         ]
@@ -711,7 +884,7 @@ class OCRApplication:
     
     def _on_settings_saved(self, new_settings):
         """设置保存回调"""
-        self.settings = new_settings
+        self._set_settings(new_settings)
         
         # 立即更新UI相关的设置（快速操作）
         self._update_ui_settings(new_settings)
@@ -738,22 +911,9 @@ class OCRApplication:
     
     def _update_instructions(self, hotkey):
         """更新使用说明（延迟执行避免阻塞）"""
-        for widget in self.master.winfo_children():
-            if isinstance(widget, ttk.LabelFrame) and widget.cget("text") == "使用说明":
-                # 清除旧说明
-                for child in widget.winfo_children():
-                    child.destroy()
-                # 添加新说明
-                instructions = [
-                    "1. 点击'开始截图'按钮或使用快捷键截图",
-                    "2. 在屏幕上拖拽选择识别区域",
-                    "3. 查看识别结果并保存",
-                    f"4. 当前截图快捷键: {hotkey}",
-                    "5. 识别完成后可手动进行翻译"
-                ]
-                for instruction in instructions:
-                    ttk.Label(widget, text=instruction, anchor=tk.W).pack(fill=tk.X, padx=10, pady=5)
-                break
+        # 直接更新已有标签文本，避免遍历控件树和重建控件
+        for label, instruction in zip(self.help_labels, self._get_instructions(hotkey)):
+            label.config(text=instruction)
     
     def _update_background_settings(self, new_settings):
         """在后台更新设置（耗时操作）"""
@@ -767,9 +927,11 @@ class OCRApplication:
             self.translation_engine.set_model(new_settings["api_model"])
             self.translation_engine.set_provider(new_settings["api_provider"])
 
-            # 更新路径
-            pytesseract.pytesseract.tesseract_cmd = new_settings["tesseract_path"]
-            if os.path.exists(new_settings["tessdata_path"]):
+            # 更新路径（用户可能修改了路径，重新检查）
+            _path_ok.cache_clear()
+            pytesseract.pytesseract.tesseract_cmd = (self.config.resolved_tesseract_path(new_settings["tesseract_path"])
+                                                     or new_settings["tesseract_path"])
+            if _path_ok(new_settings["tessdata_path"]):
                 os.environ['TESSDATA_PREFIX'] = new_settings["tessdata_path"]
 
             # 更新快捷键监听（耗时操作）
@@ -793,7 +955,7 @@ class OCRApplication:
                 self.async_processor = AsyncProcessor(max_workers=max_workers)
             
         except Exception as e:
-            self.logger.error(f"后台更新设置失败: {str(e)}")
+            self.logger.error("后台更新设置失败: %s", e)
 
     def on_closing(self):
         """程序关闭时调用"""
@@ -804,6 +966,10 @@ class OCRApplication:
         
         # 关闭异步处理器
         self.async_processor.shutdown(wait=False)
+
+        # 释放截图资源和OCR引擎句柄
+        self.screen_capture.close()
+        self.ocr_engine.close()
         
         # 清理高级缓存
         if hasattr(self, 'advanced_cache'):
@@ -19,7 +19,7 @@ class AsyncProcessor:
     def submit_task(self, task_id: str, func: Callable, *args, callback: Optional[Callable] = None, **kwargs) -> str:
         """提交异步任务"""
         if task_id in self.running_tasks:
-            self.logger.warning(f"任务 {task_id} 已在运行")
+            self.logger.warning("任务 %s 已在运行", task_id)
             return task_id
         
         future = self.executor.submit(func, *args, **kwargs)
@@ -35,33 +35,37 @@ class AsyncProcessor:
             daemon=True
         ).start()
         
-        self.logger.info(f"任务已提交: {task_id}")
+        self.logger.info("任务已提交: %s", task_id)
         return task_id
     
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """直接提交到线程池，返回Future（不跟踪任务ID和回调）"""
+        return self.executor.submit(func, *args, **kwargs)
+    
     def _monitor_task(self, task_id: str, future: Future):
         """监控任务执行"""
         try:
             result = future.result()
-            self.logger.info(f"任务完成: {task_id}")
+            self.logger.info("任务完成: %s", task_id)
             
             # 调用回调函数
             if task_id in self.callbacks:
                 try:
                     self.callbacks[task_id](result, None)
                 except Exception as e:
-                    self.logger.error(f"回调函数执行失败: {str(e)}")
+                    self.logger.error("回调函数执行失败: %s", e)
                 finally:
                     del self.callbacks[task_id]
             
         except Exception as e:
-            self.logger.error(f"任务执行失败 {task_id}: {str(e)}")
+            self.logger.error("任务执行失败 %s: %s", task_id, e)
             
             # 调用错误回调
             if task_id in self.callbacks:
                 try:
                     self.callbacks[task_id](None, e)
                 except Exception as callback_error:
-                    self.logger.error(f"错误回调执行失败: {str(callback_error)}")
+                    self.logger.error("错误回调执行失败: %s", callback_error)
                 finally:
                     del self.callbacks[task_id]
         
@@ -83,7 +87,7 @@ class AsyncProcessor:
                 del self.running_tasks[task_id]
                 if task_id in self.callbacks:
                     del self.callbacks[task_id]
-                self.logger.info(f"任务已取消: {task_id}")
+                self.logger.info("任务已取消: %s", task_id)
             return cancelled
         return False
     
@@ -118,7 +122,7 @@ class ProgressTracker:
             "start_time": time.time(),
             "status": "running"
         }
-        self.logger.info(f"开始进度跟踪: {task_id} ({description})")
+        self.logger.info("开始进度跟踪: %s (%s)", task_id, description)
     
     def update_progress(self, task_id: str, step: int, description: str = ""):
         """更新进度"""
@@ -129,18 +133,24 @@ class ProgressTracker:
         if description:
             self.progress_data[task_id]["description"] = description
         
+        callback = self.progress_callbacks.get(task_id)
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        if callback is None and not debug_enabled:
+            return
+        
         # 计算进度百分比
         total = self.progress_data[task_id]["total_steps"]
         percentage = (step / total * 100) if total > 0 else 0
         
-        self.logger.debug(f"进度更新: {task_id} - {percentage:.1f}% ({description})")
+        if debug_enabled:
+            self.logger.debug("进度更新: %s - %.1f%% (%s)", task_id, percentage, description)
         
         # 调用进度回调
-        if task_id in self.progress_callbacks:
+        if callback is not None:
             try:
-                self.progress_callbacks[task_id](percentage, description)
+                callback(percentage, description)
             except Exception as e:
-                self.logger.error(f"进度回调执行失败: {str(e)}")
+                self.logger.error("进度回调执行失败: %s", e)
     
     def complete_progress(self, task_id: str, description: str = "完成"):
         """完成进度跟踪"""
@@ -152,14 +162,14 @@ class ProgressTracker:
         self.progress_data[task_id]["end_time"] = time.time()
         
         elapsed_time = self.progress_data[task_id]["end_time"] - self.progress_data[task_id]["start_time"]
-        self.logger.info(f"进度完成: {task_id} - 耗时 {elapsed_time:.2f}秒")
+        self.logger.info("进度完成: %s - 耗时 %.2f秒", task_id, elapsed_time)
         
         # 调用完成回调
         if task_id in self.progress_callbacks:
             try:
                 self.progress_callbacks[task_id](100, description)
             except Exception as e:
-                self.logger.error(f"完成回调执行失败: {str(e)}")
+                self.logger.error("完成回调执行失败: %s", e)
     
     def add_progress_callback(self, task_id: str, callback: Callable):
         """添加进度回调函数"""
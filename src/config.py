@@ -1,101 +1,293 @@
 # config.py - 增强配置管理模块
+import copy
 import json
 import os
 import logging
 import shutil
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 用于区分"键不存在"和"值为None"
+_MISSING = object()
+
+# 已解析配置文件缓存: (绝对路径, st_mtime_ns, st_size) -> 解析结果
+_SETTINGS_CACHE: Dict[tuple, Dict[str, Any]] = {}
+_SETTINGS_CACHE_LOCK = threading.Lock()
+
+def _invalidate_settings_cache(config_file: str):
+    """清除指定配置文件的解析缓存"""
+    abspath = os.path.abspath(config_file)
+    with _SETTINGS_CACHE_LOCK:
+        for key in [k for k in _SETTINGS_CACHE if k[0] == abspath]:
+            del _SETTINGS_CACHE[key]
+
+def _deep_merge(defaults: Mapping, overrides: Mapping) -> Dict[str, Any]:
+    """递归合并配置，返回全新字典：嵌套字典逐键合并，其余值以overrides为准"""
+    merged = {}
+    for key, value in defaults.items():
+        merged[key] = _deep_merge(value, {}) if isinstance(value, Mapping) else copy.deepcopy(value)
+    for key, value in overrides.items():
+        base = defaults.get(key)
+        if isinstance(base, Mapping) and isinstance(value, Mapping):
+            merged[key] = _deep_merge(base, value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+def _copy_file(src: str, dst: str, preserve_meta: bool = False):
+    """用大缓冲区复制文件内容（配置文件通常一次读写即可完成）"""
+    with open(src, 'rb', buffering=0) as fsrc, open(dst, 'wb', buffering=0) as fdst:
+        shutil.copyfileobj(fsrc, fdst, length=1 << 20)
+    if preserve_meta:
+        shutil.copystat(src, dst)
+
+def _freeze(value: Any) -> Any:
+    """递归生成只读配置：字典转为MappingProxyType，列表转为元组"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+# 默认配置，导入时构建一次；需要可修改的副本时通过_deep_merge生成
+_DEFAULT_SETTINGS_FROZEN = _freeze({
+    "ocr_config": {
+        "language": "chi_sim+eng",
+        "psm": "6",  # 单一文本块：界面截图无需完整版面分析；零散标签可用11
+        "oem": "1"  # 仅LSTM引擎，不加载传统引擎数据
+    },
+    "offset": {
+        "horizontal": 0,
+        "vertical": 0
+    },
+    "tesseract_path": r'C:\Program Files\Tesseract-OCR\tesseract.exe',
+    "tessdata_path": r'C:\Program Files\Tesseract-OCR\tessdata',
+    "api_provider": "openai",  # "openai" 或 "deepseek"
+    "api_key": "",
+    "api_model": "gpt-3.5-turbo",
+    "preprocessing": {
+        "grayscale": True,
+        "invert": False,
+        "threshold": 0,
+        "auto_threshold": False,  # 忽略threshold，按Otsu方法自动计算
+        "method": "global"  # "global"全局阈值 或 "sauvola"局部自适应阈值
+    },
+    "hide_window_on_capture": False,
+    "hotkey": "ctrl+alt+s",
+    "parallel_ocr_fallback": False,  # 并行执行英文回退识别（CPU占用翻倍）
+    "auto_save": False  # 每次识别后保存ocr_result.txt和screenshot.png
+})
+
+def _loads_settings(data: bytes) -> Dict[str, Any]:
+    """解析UTF-8编码的JSON配置（优先使用orjson）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+def _tesseract_candidates():
+    """按平台列出可能的Tesseract可执行文件路径（PATH中的优先）"""
+    candidates = []
+    found = shutil.which("tesseract")
+    if found:
+        candidates.append(found)
+    if sys.platform == 'win32':
+        candidates += [
+            r'C:\Program Files\Tesseract-OCR\tesseract.exe',
+            r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe'
+        ]
+    elif sys.platform == 'darwin':
+        candidates += ['/opt/homebrew/bin/tesseract', '/usr/local/bin/tesseract']
+    else:
+        candidates += ['/usr/bin/tesseract', '/usr/local/bin/tesseract']
+    return candidates
+
+def _dumps_settings(settings: Dict[str, Any]) -> bytes:
+    """将配置序列化为UTF-8编码的JSON（优先使用orjson）"""
+    if orjson is not None:
+        return orjson.dumps(settings, option=orjson.OPT_INDENT_2)
+    return json.dumps(settings, indent=2, ensure_ascii=False).encode('utf-8')
+
+@dataclass(frozen=True)
+class CaptureSnapshot:
+    """截图流程使用的配置快照，设置变化时整体重建"""
+    __slots__ = ('hoffset', 'voffset', 'hide_window_on_capture')
+    hoffset: int
+    voffset: int
+    hide_window_on_capture: bool
+
+    @classmethod
+    def from_settings(cls, settings) -> "CaptureSnapshot":
+        """从完整配置字典构建快照"""
+        offset = settings.get("offset", {})
+        return cls(
+            hoffset=offset.get("horizontal", 0),
+            voffset=offset.get("vertical", 0),
+            hide_window_on_capture=settings.get("hide_window_on_capture", False)
+        )
+
+_CONFIG_LOGGER = logging.getLogger("Config")
+
 class Config:
     """增强的配置管理类"""
     
-    # 默认配置
-    DEFAULT_SETTINGS = {
-        "ocr_config": {
-            "language": "chi_sim+eng",
-            "psm": "3",
-            "oem": "3"
-        },
-        "offset": {
-            "horizontal": 0,
-            "vertical": 0
-        },
-        "tesseract_path": r'C:\Program Files\Tesseract-OCR\tesseract.exe',
-        "tessdata_path": r'C:\Program Files\Tesseract-OCR\tessdata',
-        "api_provider": "openai",  # "openai" 或 "deepseek"
-        "api_key": "",
-        "api_model": "gpt-3.5-turbo",
-        "preprocessing": {
-            "grayscale": True,
-            "invert": False,
-            "threshold": 0
-        },
-        "hide_window_on_capture": False,
-        "hotkey": "ctrl+alt+s"
+    __slots__ = ('logger', 'config_file', '_settings', '_readonly', '_path_cache', '_validate_cache',
+                 '_resolved_tesseract')
+    
+    # 默认配置（只读模板）
+    DEFAULT_SETTINGS = _DEFAULT_SETTINGS_FROZEN
+    
+    # API提供商显示名称
+    PROVIDER_NAMES = {
+        "openai": "OpenAI",
+        "deepseek": "DeepSeek"
     }
     
+    # 验证结果缓存有效期（秒）
+    VALIDATE_CACHE_TTL = 2.0
+    
     def __init__(self, config_file: str = "settings.json"):
-        self.logger = logging.getLogger("Config")
+        self.logger = _CONFIG_LOGGER
         self.config_file = config_file
-        self._settings = self._load_settings()
+        self._replace_settings(self._load_settings())
+        self._resolved_tesseract = None
+        self.resolved_tesseract_path()
+    
+    def _resolve_tesseract_path(self, configured: Optional[str]) -> Optional[str]:
+        """确定可用的Tesseract路径，配置的路径无效时按平台候选路径查找"""
+        if configured and os.path.exists(configured):
+            return configured
+        for candidate in _tesseract_candidates():
+            if os.path.exists(candidate):
+                self.logger.info("使用检测到的Tesseract路径: %s", candidate)
+                return candidate
+        return None
+    
+    def resolved_tesseract_path(self, configured: Optional[str] = None) -> Optional[str]:
+        """获取实际可用的Tesseract路径（按配置的路径缓存找到的结果，不写回配置）"""
+        if configured is None:
+            configured = self.get("tesseract_path")
+        cached = self._resolved_tesseract
+        # 未找到时不缓存，安装Tesseract或驱动器恢复后下次即可找到
+        if cached is None or cached[0] != configured or cached[1] is None:
+            cached = (configured, self._resolve_tesseract_path(configured))
+            self._resolved_tesseract = cached
+        return cached[1]
+    
+    def _defaults_mutable(self) -> Dict[str, Any]:
+        """获取默认配置的可修改深拷贝"""
+        return _deep_merge(self.DEFAULT_SETTINGS, {})
+    
+    def _replace_settings(self, settings: Dict[str, Any]):
+        """替换整个配置字典，并使依赖它的只读视图失效"""
+        self._settings = settings
+        self._readonly = None
+        self._path_cache = {}
+        self._validate_cache = None
     
     def _load_settings(self) -> Dict[str, Any]:
-        """加载配置文件"""
-        if os.path.exists(self.config_file):
-            try:
+        """加载配置文件（文件未变化时复用已解析的结果）"""
+        try:
+            st = os.stat(self.config_file)
+        except OSError:
+            return self._defaults_mutable()
+
+        cache_key = (os.path.abspath(self.config_file), st.st_mtime_ns, st.st_size)
+        try:
+            with _SETTINGS_CACHE_LOCK:
+                settings = _SETTINGS_CACHE.get(cache_key)
+            if settings is None:
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     settings = json.load(f)
-                # 合并默认设置，确保所有键都存在
-                merged_settings = self.DEFAULT_SETTINGS.copy()
-                merged_settings.update(settings)
-                return merged_settings
-            except Exception as e:
-                self.logger.error(f"加载配置文件失败: {str(e)}, 使用默认设置")
-                return self.DEFAULT_SETTINGS.copy()
-        return self.DEFAULT_SETTINGS.copy()
+                with _SETTINGS_CACHE_LOCK:
+                    _SETTINGS_CACHE[cache_key] = settings
+            # 递归合并默认设置，确保嵌套配置的键也都存在（合并结果不与缓存共享对象）
+            return _deep_merge(self.DEFAULT_SETTINGS, settings)
+        except Exception as e:
+            self.logger.error("加载配置文件失败: %s, 使用默认设置", e)
+            return self._defaults_mutable()
     
     def save_settings(self) -> bool:
         """保存配置到文件"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._settings, f, indent=2, ensure_ascii=False)
+            # 先整体序列化，再一次写入
+            data = _dumps_settings(self._settings)
+            with open(self.config_file, 'wb') as f:
+                f.write(data)
+            _invalidate_settings_cache(self.config_file)
             return True
         except Exception as e:
-            self.logger.error(f"保存配置失败: {str(e)}")
+            self.logger.error("保存配置失败: %s", e)
             return False
     
     def get(self, key: str, default=None):
         """获取配置值"""
-        keys = key.split('.')
-        value = self._settings
-        try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+        # 缓存 点分路径 -> (所在子字典, 叶子键)，命中时只需一次字典查找
+        cached = self._path_cache.get(key)
+        if cached is None:
+            keys = key.split('.')
+            container = self._settings
+            try:
+                for k in keys[:-1]:
+                    container = container[k]
+            except (KeyError, TypeError):
+                return default
+            if not isinstance(container, dict):
+                return default
+            cached = (container, keys[-1])
+            self._path_cache[key] = cached
+        container, leaf = cached
+        return container.get(leaf, default)
     
     def set(self, key: str, value: Any):
         """设置配置值"""
         keys = key.split('.')
         settings = self._settings
         for k in keys[:-1]:
-            if k not in settings:
-                settings[k] = {}
-            settings = settings[k]
-        settings[keys[-1]] = value
-        self.logger.debug(f"配置已更新: {key} = {value}")
+            settings = settings.setdefault(k, {})
+        leaf = keys[-1]
+        # 值未变化时直接返回（UI控件可能频繁写入相同的值）
+        if settings.get(leaf, _MISSING) == value:
+            return
+        settings[leaf] = value
+        # 写入可能替换中间层字典，缓存的子字典引用随之失效
+        self._path_cache.clear()
+        self._validate_cache = None
+        self._readonly = None
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("配置已更新: %s = %r", key, value)
+    
+    def get_all(self) -> MappingProxyType:
+        """获取所有配置（逐层只读的快照，配置变化前一直复用）"""
+        readonly = self._readonly
+        if readonly is None:
+            readonly = self._readonly = _freeze(self._settings)
+        return readonly
     
-    def get_all(self) -> Dict[str, Any]:
-        """获取所有配置"""
-        return self._settings.copy()
+    def get_all_mutable(self) -> Dict[str, Any]:
+        """获取所有配置的可修改深拷贝（修改不会影响当前配置）"""
+        return _deep_merge(self._settings, {})
     
     def update(self, new_settings: Dict[str, Any]):
         """批量更新配置"""
-        self._settings.update(new_settings)
+        # 复制传入的嵌套字典，调用方之后修改它们不会绕过缓存失效直接改动配置
+        self._settings.update(_deep_merge(new_settings, {}))
+        self._path_cache.clear()
+        self._validate_cache = None
+        self._readonly = None
         # 配置已批量更新
     
-    def backup_config(self, backup_dir: str = "backups") -> bool:
+    def backup_config(self, backup_dir: str = "backups", preserve_meta: bool = False) -> bool:
         """备份配置文件"""
         try:
             if not os.path.exists(backup_dir):
@@ -105,68 +297,87 @@ class Config:
             backup_file = os.path.join(backup_dir, f"settings_backup_{timestamp}.json")
             
             if os.path.exists(self.config_file):
-                shutil.copy2(self.config_file, backup_file)
-                self.logger.info(f"配置已备份到: {backup_file}")
+                _copy_file(self.config_file, backup_file, preserve_meta)
+                self.logger.info("配置已备份到: %s", backup_file)
                 return True
             return False
         except Exception as e:
-            self.logger.error(f"备份配置失败: {str(e)}")
+            self.logger.error("备份配置失败: %s", e)
             return False
     
     def restore_config(self, backup_file: str) -> bool:
         """从备份恢复配置"""
         try:
             if not os.path.exists(backup_file):
-                self.logger.error(f"备份文件不存在: {backup_file}")
+                self.logger.error("备份文件不存在: %s", backup_file)
                 return False
             
-            shutil.copy2(backup_file, self.config_file)
-            self._settings = self._load_settings()
-            self.logger.info(f"配置已从备份恢复: {backup_file}")
+            # 只读取一次备份：先解析（损坏的备份不会覆盖当前配置），再原样写回
+            with open(backup_file, 'rb') as f:
+                data = f.read()
+            restored_settings = _loads_settings(data)
+            with open(self.config_file, 'wb') as f:
+                f.write(data)
+            _invalidate_settings_cache(self.config_file)
+            self._replace_settings(_deep_merge(self.DEFAULT_SETTINGS, restored_settings))
+            self.logger.info("配置已从备份恢复: %s", backup_file)
             return True
         except Exception as e:
-            self.logger.error(f"恢复配置失败: {str(e)}")
+            self.logger.error("恢复配置失败: %s", e)
             return False
     
     def validate_config(self) -> Dict[str, Any]:
-        """验证配置有效性"""
+        """验证配置有效性（短时间内配置未变化时复用上次结果）"""
+        tesseract_path = self.get("tesseract_path")
+        tessdata_path = self.get("tessdata_path")
+        api_key = self.get("api_key")
+        provider = self.get("api_provider", "openai")
+        hotkey = self.get("hotkey")
+        api_key_set = bool(api_key and api_key.strip())
+        cache_key = (tesseract_path, tessdata_path, api_key_set, provider, hotkey)
+        
+        now = time.monotonic()
+        cached = self._validate_cache
+        if cached is not None and cached[0] == cache_key and now - cached[1] < self.VALIDATE_CACHE_TTL:
+            return copy.deepcopy(cached[2])
+        
         validation_result = {
             "valid": True,
             "errors": [],
             "warnings": []
         }
         
-        # 检查Tesseract路径
-        tesseract_path = self.get("tesseract_path")
-        if not tesseract_path or not os.path.exists(tesseract_path):
+        # 检查Tesseract路径（同一配置路径的查找结果已缓存，不再重复检查）
+        if not self.resolved_tesseract_path(tesseract_path):
             validation_result["errors"].append(f"Tesseract路径无效: {tesseract_path}")
             validation_result["valid"] = False
         
         # 检查语言包路径
-        tessdata_path = self.get("tessdata_path")
         if not tessdata_path or not os.path.exists(tessdata_path):
             validation_result["warnings"].append(f"语言包路径无效: {tessdata_path}")
         
         # 检查API密钥
-        api_key = self.get("api_key")
-        provider = self.get("api_provider", "openai")
-        provider_name = "DeepSeek" if provider == "deepseek" else "OpenAI"
-        if not api_key or api_key.strip() == "":
+        if not api_key_set:
+            provider_name = self.PROVIDER_NAMES.get(provider, "OpenAI")
             validation_result["warnings"].append(f"{provider_name} API密钥未设置")
         
         # 检查快捷键格式
-        hotkey = self.get("hotkey")
         if not hotkey or not isinstance(hotkey, str):
             validation_result["errors"].append("快捷键格式无效")
             validation_result["valid"] = False
         
-        return validation_result
+        self._validate_cache = (cache_key, now, validation_result)
+        return copy.deepcopy(validation_result)
     
     def get_config_info(self) -> Dict[str, Any]:
         """获取配置信息摘要"""
+        try:
+            last_modified = datetime.fromtimestamp(os.stat(self.config_file).st_mtime).isoformat()
+        except OSError:
+            last_modified = None
         return {
             "config_file": self.config_file,
-            "last_modified": datetime.fromtimestamp(os.path.getmtime(self.config_file)).isoformat() if os.path.exists(self.config_file) else None,
+            "last_modified": last_modified,
             "total_keys": len(self._settings),
             "validation": self.validate_config()
         }
@@ -174,64 +385,64 @@ class Config:
     def export_config(self, export_path: str) -> bool:
         """导出配置到文件"""
         try:
-            with open(export_path, 'w', encoding='utf-8') as f:
-                json.dump(self._settings, f, indent=2, ensure_ascii=False)
-            self.logger.info(f"配置已导出到: {export_path}")
+            data = _dumps_settings(self._settings)
+            with open(export_path, 'wb') as f:
+                f.write(data)
+            self.logger.info("配置已导出到: %s", export_path)
             return True
         except Exception as e:
-            self.logger.error(f"导出配置失败: {str(e)}")
+            self.logger.error("导出配置失败: %s", e)
             return False
     
     def import_config(self, import_path: str) -> bool:
         """从文件导入配置"""
         try:
-            with open(import_path, 'r', encoding='utf-8') as f:
-                imported_settings = json.load(f)
+            with open(import_path, 'rb') as f:
+                imported_settings = _loads_settings(f.read())
             
             # 合并配置
-            merged_settings = self.DEFAULT_SETTINGS.copy()
-            merged_settings.update(imported_settings)
+            merged_settings = _deep_merge(self.DEFAULT_SETTINGS, imported_settings)
             
-            self._settings = merged_settings
+            self._replace_settings(merged_settings)
             self.save_settings()
-            self.logger.info(f"配置已从文件导入: {import_path}")
+            self.logger.info("配置已从文件导入: %s", import_path)
             return True
         except Exception as e:
-            self.logger.error(f"导入配置失败: {str(e)}")
+            self.logger.error("导入配置失败: %s", e)
             return False
     
     def reset_to_defaults(self) -> bool:
         """重置为默认配置"""
         try:
-            self._settings = self.DEFAULT_SETTINGS.copy()
+            self._replace_settings(self._defaults_mutable())
             self.save_settings()
             self.logger.info("配置已重置为默认值")
             return True
         except Exception as e:
-            self.logger.error(f"重置配置失败: {str(e)}")
+            self.logger.error("重置配置失败: %s", e)
             return False
     
     def get_config_diff(self, other_config: Dict[str, Any]) -> Dict[str, Any]:
         """比较配置差异"""
-        diff = {
-            "added": {},
-            "modified": {},
-            "removed": {}
-        }
+        settings = self._settings
+        own_keys = settings.keys()
+        other_keys = other_config.keys()
         
-        # 检查新增和修改的配置
-        for key, value in other_config.items():
-            if key not in self._settings:
-                diff["added"][key] = value
-            elif self._settings[key] != value:
-                diff["modified"][key] = {
-                    "old": self._settings[key],
-                    "new": value
+        # 利用字典键视图的集合运算找出新增、删除和共有的配置项
+        added = {key: other_config[key] for key in other_keys - own_keys}
+        removed = {key: settings[key] for key in own_keys - other_keys}
+        modified = {}
+        for key in own_keys & other_keys:
+            old_value = settings[key]
+            new_value = other_config[key]
+            if old_value != new_value:
+                modified[key] = {
+                    "old": old_value,
+                    "new": new_value
                 }
         
-        # 检查删除的配置
-        for key in self._settings:
-            if key not in other_config:
-                diff["removed"][key] = self._settings[key]
-        
-        return diff
+        return {
+            "added": added,
+            "modified": modified,
+            "removed": removed
+        }
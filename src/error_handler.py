@@ -1,19 +1,37 @@
 # error_handler.py - 增强错误处理模块
 import logging
-import traceback
+import sys
 import tkinter as tk
 from tkinter import messagebox
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Tuple
 import time
 from functools import wraps
 
+_NO_RECORD = (0, 0.0)
+
 class ErrorHandler:
     """增强的错误处理器"""
     
-    def __init__(self, logger_name: str = "ErrorHandler"):
+    __slots__ = ('logger', '_tk_root', 'error_records', 'error_callbacks')
+    
+    # 异常类型 -> 用户友好提示（导入时构建一次）
+    _USER_MESSAGES = {
+        sys.intern("TesseractNotFoundError"): "OCR引擎未找到，请检查Tesseract安装路径",
+        sys.intern("TesseractError"): "OCR识别失败，请检查图像质量或语言设置",
+        sys.intern("ConnectionError"): "网络连接失败，请检查网络连接",
+        sys.intern("TimeoutError"): "请求超时，请稍后重试",
+        sys.intern("FileNotFoundError"): "文件未找到，请检查文件路径",
+        sys.intern("PermissionError"): "权限不足，请检查文件权限",
+        sys.intern("ValueError"): "参数错误，请检查输入值",
+        sys.intern("KeyError"): "配置错误，请检查设置文件"
+    }
+    _MESSAGE_TEMPLATE = "{base}\n\n详细信息: {detail}"
+    
+    def __init__(self, logger_name: str = "ErrorHandler", tk_root: Optional[tk.Misc] = None):
         self.logger = logging.getLogger(logger_name)
-        self.error_count = {}
-        self.last_error_time = {}
+        self._tk_root = tk_root
+        # 错误记录: error_key -> (出现次数, 最近一次时间)
+        self.error_records: Dict[str, Tuple[int, float]] = {}
         self.error_callbacks = []
     
     def handle_exception(self, e: Exception, context: str = "", show_dialog: bool = True) -> str:
@@ -22,13 +40,14 @@ class ErrorHandler:
         error_type = type(e).__name__
         
         # 记录错误统计
-        error_key = f"{error_type}:{context}"
-        self.error_count[error_key] = self.error_count.get(error_key, 0) + 1
-        self.last_error_time[error_key] = time.time()
+        error_key = error_type + ":" + context
+        count = self.error_records.get(error_key, _NO_RECORD)[0]
+        self.error_records[error_key] = (count + 1, time.time())
         
         # 记录错误信息
-        self.logger.error(f"错误 [{context}]: {error_msg}")
-        self.logger.debug(f"错误详情: {traceback.format_exc()}")
+        self.logger.error("错误 [%s]: %s", context, error_msg)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("错误详情", exc_info=e)
         
         # 显示用户友好的错误信息
         user_msg = self._get_user_friendly_message(error_type, error_msg, context)
@@ -38,7 +57,7 @@ class ErrorHandler:
             try:
                 callback(e, context, user_msg)
             except Exception as callback_error:
-                self.logger.error(f"错误回调执行失败: {str(callback_error)}")
+                self.logger.error("错误回调执行失败: %s", callback_error)
         
         if show_dialog:
             self._show_error_dialog(user_msg, context)
@@ -47,31 +66,27 @@ class ErrorHandler:
     
     def _get_user_friendly_message(self, error_type: str, error_msg: str, context: str) -> str:
         """获取用户友好的错误信息"""
-        error_messages = {
-            "TesseractNotFoundError": "OCR引擎未找到，请检查Tesseract安装路径",
-            "TesseractError": "OCR识别失败，请检查图像质量或语言设置",
-            "ConnectionError": "网络连接失败，请检查网络连接",
-            "TimeoutError": "请求超时，请稍后重试",
-            "FileNotFoundError": "文件未找到，请检查文件路径",
-            "PermissionError": "权限不足，请检查文件权限",
-            "ValueError": "参数错误，请检查输入值",
-            "KeyError": "配置错误，请检查设置文件"
-        }
-        
-        if error_type in error_messages:
-            return f"{error_messages[error_type]}\n\n详细信息: {error_msg}"
-        
-        return f"发生未知错误: {error_msg}"
+        base = self._USER_MESSAGES.get(error_type)
+        if base is None:
+            return f"发生未知错误: {error_msg}"
+        return self._MESSAGE_TEMPLATE.format(base=base, detail=error_msg)
     
     def _show_error_dialog(self, message: str, context: str):
         """显示错误对话框"""
         try:
+            # 优先复用应用已有的根窗口，避免每次报错都初始化新的Tk解释器
+            parent = self._tk_root or tk._default_root
+            if parent is not None:
+                messagebox.showerror(f"错误 - {context}", message, parent=parent)
+                return
+
+            # 尚无根窗口（启动早期或无界面环境）时才临时创建
             root = tk.Tk()
             root.withdraw()
-            messagebox.showerror(f"错误 - {context}", message)
+            messagebox.showerror(f"错误 - {context}", message, parent=root)
             root.destroy()
         except Exception as e:
-            self.logger.error(f"显示错误对话框失败: {str(e)}")
+            self.logger.error("显示错误对话框失败: %s", e)
     
     def add_error_callback(self, callback: Callable):
         """添加错误回调函数"""
@@ -84,32 +99,36 @@ class ErrorHandler:
     
     def get_error_stats(self) -> Dict[str, Any]:
         """获取错误统计信息"""
+        records = self.error_records
         return {
-            "error_count": self.error_count.copy(),
-            "last_error_time": self.last_error_time.copy(),
-            "total_errors": sum(self.error_count.values())
+            "error_count": {key: record[0] for key, record in records.items()},
+            "last_error_time": {key: record[1] for key, record in records.items()},
+            "total_errors": sum(record[0] for record in records.values())
         }
     
     def clear_error_stats(self):
         """清空错误统计"""
-        self.error_count.clear()
-        self.last_error_time.clear()
+        self.error_records.clear()
         self.logger.info("错误统计已清空")
 
+# 进程级默认错误处理器，供safe_execute复用
+_DEFAULT_HANDLER = ErrorHandler()
+
 def safe_execute(func, *args, context: str = "", show_dialog: bool = True, **kwargs):
     """安全执行函数，自动处理异常"""
-    error_handler = ErrorHandler()
     try:
         return func(*args, **kwargs)
     except Exception as e:
-        return error_handler.handle_exception(e, context, show_dialog)
+        return _DEFAULT_HANDLER.handle_exception(e, context, show_dialog)
 
 def error_handler_decorator(context: str = "", show_dialog: bool = True):
     """错误处理装饰器"""
     def decorator(func):
+        # 每个被装饰函数只创建一个处理器，错误统计在多次调用间累积
+        error_handler = ErrorHandler()
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            error_handler = ErrorHandler()
             try:
                 return func(*args, **kwargs)
             except Exception as e:
@@ -7,13 +7,19 @@ import traceback
 # 添加当前目录到系统路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# 日志系统是否已初始化
+_LOGGING_INITIALIZED = False
+
 # 配置统一日志
 def setup_logging():
-    """配置统一的日志系统"""
+    """配置统一的日志系统（重复调用时直接返回）"""
+    global _LOGGING_INITIALIZED
+    if _LOGGING_INITIALIZED:
+        return
+
     # 创建日志目录
     log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    os.makedirs(log_dir, exist_ok=True)
 
     # 创建日志文件路径
     log_file = os.path.join(log_dir, "ocr_tool.log")
@@ -27,16 +33,22 @@ def setup_logging():
         filemode='a'  # 追加模式
     )
 
-    # 添加控制台输出
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(formatter)
-    logging.getLogger().addHandler(console_handler)
+    # 添加控制台输出（已存在控制台处理器时不重复添加，避免日志重复输出）
+    root_logger = logging.getLogger()
+    if not any(
+        isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler)
+        for h in root_logger.handlers
+    ):
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        console_handler.setFormatter(formatter)
+        root_logger.addHandler(console_handler)
 
     # 设置全局异常处理
     sys.excepthook = handle_exception
 
+    _LOGGING_INITIALIZED = True
     logging.info("统一日志系统已初始化")
 
 # 全局异常处理
@@ -1,11 +1,217 @@
 # ocr_engine.py - 优化OCR引擎
 import pytesseract
-from PIL import Image, ImageOps, ImageEnhance
+from PIL import Image, ImageEnhance
+import contextlib
+import functools
+import hashlib
 import logging
+import os
+import threading
 import time
+from collections import OrderedDict
 from typing import Optional, Dict, Any, Callable
 from error_handler import error_handler_decorator
 
+# 可选：进程内调用libtesseract，避免每次识别都启动子进程并写临时文件
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+# 可选：NumPy用于局部自适应二值化
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 可选：更快的非加密哈希，用于识别结果缓存
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# 空闲tesserocr句柄池：(语言包路径, 语言, psm, oem) -> 空闲句柄列表。
+# 单个句柄不是线程安全的，每个线程借用独立句柄；识别期间释放GIL，可真正并发。
+# 目前的并发调用方是并行回退识别：主语言在调用线程、英文在线程池中各借一个句柄
+_TESS_POOL = OrderedDict()
+_TESS_POOL_LOCK = threading.Lock()
+_TESS_POOL_MAX_KEYS = 4
+
+
+@contextlib.contextmanager
+def _borrow_tess_api(tessdata, lang, psm, oem):
+    """借用已初始化的Tesseract句柄（避免重复加载语言数据），用完归还到池中"""
+    key = (tessdata, lang, psm, oem)
+    with _TESS_POOL_LOCK:
+        idle = _TESS_POOL.get(key)
+        api = idle.pop() if idle else None
+    if api is None:
+        kwargs = {'lang': lang, 'psm': psm, 'oem': oem}
+        if tessdata:
+            kwargs['path'] = tessdata
+        api = tesserocr.PyTessBaseAPI(**kwargs)
+    try:
+        yield api
+    finally:
+        with _TESS_POOL_LOCK:
+            _TESS_POOL.setdefault(key, []).append(api)
+            _TESS_POOL.move_to_end(key)
+            # 只保留最近使用的几组参数，淘汰的句柄析构时调用End
+            while len(_TESS_POOL) > _TESS_POOL_MAX_KEYS:
+                _TESS_POOL.popitem(last=False)
+
+
+# 可直接以原始字节交给SetImageBytes的图像模式及每像素字节数
+_RAW_BYTES_PER_PIXEL = {'L': 1, 'RGB': 3, 'RGBA': 4}
+
+
+def _image_digest(image):
+    """计算图像像素内容的摘要（优先使用xxhash）"""
+    data = image.tobytes()
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _compose_contrast(lut, hist, factor):
+    """在查找表之后叠加对比度增强，与ImageEnhance.Contrast一致以映射后的灰度均值为中心"""
+    total = sum(hist) or 1
+    mean = int(sum(h * v for h, v in zip(hist, lut)) / total + 0.5)
+    return _stretch_lut(lut, mean, factor)
+
+
+@functools.lru_cache(maxsize=64)
+def _stretch_lut(lut, mean, factor):
+    """以mean为中心按factor拉伸查找表的输出值，按参数缓存"""
+    return tuple(min(255, max(0, int(mean + factor * (v - mean)))) for v in lut)
+
+
+@functools.lru_cache(maxsize=32)
+def _point_lut(invert, threshold):
+    """反色与二值化合成的查找表，按参数缓存"""
+    lut = range(256)
+    if invert:
+        lut = [255 - v for v in lut]
+    if threshold > 0:
+        lut = [255 if v > threshold else 0 for v in lut]
+    return tuple(lut)
+
+
+def _otsu_threshold(hist):
+    """由256级灰度直方图计算Otsu阈值（使类间方差最大的分割点）"""
+    total = sum(hist)
+    sum_all = sum(i * h for i, h in enumerate(hist))
+    w0 = sum0 = 0
+    best_t, best_var = 0, -1.0
+    for t, h in enumerate(hist):
+        w0 += h
+        sum0 += t * h
+        w1 = total - w0
+        if w0 == 0:
+            continue
+        if w1 == 0:
+            break
+        diff = sum0 / w0 - (sum_all - sum0) / w1
+        var = w0 * w1 * diff * diff
+        if var > best_var:
+            best_t, best_var = t, var
+    return best_t
+
+
+def enhance_gray(image, invert, threshold, contrast, auto_threshold=False):
+    """对灰度图用一张查找表完成反色、二值化和对比度增强"""
+    if not auto_threshold and not invert and threshold <= 0 and contrast == 1.0:
+        # 各步骤均为恒等变换，无需遍历像素
+        return image
+    hist = image.histogram()
+    if auto_threshold:
+        # 阈值作用于反色之后的图像，直方图相应翻转
+        threshold = _otsu_threshold(hist[::-1] if invert else hist)
+    lut = _point_lut(bool(invert), int(threshold))
+    return image.point(_compose_contrast(lut, hist, contrast))
+
+
+def _sauvola(image, window=25, k=0.2, r=128.0):
+    """Sauvola局部阈值二值化：用积分图求窗口均值和标准差，耗时与窗口大小无关"""
+    arr = np.asarray(image, dtype=np.float64)
+    half = window // 2
+    padded = np.pad(arr, half, mode='edge')
+
+    def window_sum(values):
+        integral = np.zeros((values.shape[0] + 1, values.shape[1] + 1))
+        integral[1:, 1:] = values.cumsum(axis=0).cumsum(axis=1)
+        return (integral[window:, window:] - integral[:-window, window:]
+                - integral[window:, :-window] + integral[:-window, :-window])
+
+    n = window * window
+    mean = window_sum(padded) / n
+    std = np.sqrt(np.maximum(window_sum(padded * padded) / n - mean * mean, 0.0))
+    thresh = mean * (1.0 + k * (std / r - 1.0))
+    return Image.fromarray(np.where(arr > thresh, 255, 0).astype(np.uint8), 'L')
+
+
+def preprocess(image, grayscale=True, invert=False, threshold=0, contrast=1.2, auto_threshold=False,
+               method='global'):
+    """OCR预处理流程：灰度、反色、二值化、对比度增强，全程使用查找表而非逐像素回调"""
+    # 灰度处理（已是灰度图时跳过转换，避免整图复制）
+    if grayscale and image.mode != 'L':
+        image = image.convert('L')
+
+    if method == 'sauvola' and np is not None:
+        # 局部自适应二值化，适合明暗面板混排的界面截图；二值图无需再增强对比度
+        if image.mode != 'L':
+            image = image.convert('L')
+        if invert:
+            image = image.point(_point_lut(True, 0))
+        return _sauvola(image)
+
+    if image.mode == 'L':
+        # 反色、二值化、对比度合成一张查找表，只遍历一次像素
+        # （实测快于OpenCV cvtColor+LUT：后者需在PIL与ndarray之间来回复制整图）
+        return enhance_gray(image, invert, threshold, contrast, auto_threshold)
+
+    if image.mode in ('RGB', 'RGBA'):
+        # 彩色图：反色、二值化、对比度合成逐通道查找表，一次遍历完成（透明通道保持不变）
+        if not invert and threshold <= 0 and contrast == 1.0:
+            return image
+        lut = _point_lut(bool(invert), int(threshold))
+        if contrast != 1.0:
+            # 对比度中心为灰度均值：由各通道直方图按亮度权重(ITU-R 601)合成
+            hist = image.histogram()
+            total = image.width * image.height or 1
+            r, g, b = (sum(h * v for h, v in zip(hist[i:i + 256], lut)) / total for i in (0, 256, 512))
+            lut = _stretch_lut(lut, int(r * 0.299 + g * 0.587 + b * 0.114 + 0.5), contrast)
+        if image.mode == 'RGBA':
+            return image.point(lut * 3 + _point_lut(False, 0))
+        return image.point(lut * 3)
+
+    # 其他模式：反色与二值化合成逐通道查找表，对比度按整体灰度均值增强
+    if invert or threshold > 0:
+        image = image.point(_point_lut(bool(invert), int(threshold)) * len(image.getbands()))
+    if contrast != 1.0:
+        image = ImageEnhance.Contrast(image).enhance(contrast)
+    return image
+
+def preprocess_with_params(image, params):
+    """按OCREngine.preprocess_params()返回的参数执行预处理（不读写引擎的结果缓存）"""
+    settings, contrast = params
+    settings = dict(settings)
+    return preprocess(
+        image,
+        grayscale=settings.get("grayscale", True),
+        invert=settings.get("invert", False),
+        threshold=settings.get("threshold", 0),
+        contrast=contrast,
+        auto_threshold=settings.get("auto_threshold", False),
+        method=settings.get("method", "global")
+    )
+
+def is_scale_sensitive(params):
+    """预处理结果是否依赖图像分辨率：Otsu阈值取自整图直方图，Sauvola窗口为固定像素大小，
+    在缩小图上计算与在原图上计算的结果不同；其余为逐像素查找表，可直接作用于缩小图"""
+    settings = dict(params[0])
+    return bool(settings.get("auto_threshold", False)) or settings.get("method", "global") == "sauvola"
+
 class OCREngine:
     """优化的OCR识别引擎"""
 
@@ -17,14 +223,20 @@ class OCREngine:
         # 默认配置
         self.config = {
             'language': 'chi_sim+eng',
-            'psm': '3',
-            'oem': '3'
+            'psm': '6',  # 单一文本块，适合界面截图
+            'oem': '1'  # 仅LSTM引擎
         }
         self.preprocessing = {
             "grayscale": True,
             "invert": False,
-            "threshold": 0
+            "threshold": 0,
+            "auto_threshold": False,
+            "method": "global"
         }
+        # 对比度增强倍数（1.0表示不增强）
+        self.contrast_factor = 1.2
+        # 最近一次预处理：(源图像, 预处理参数, 结果)，供结果窗口预览复用
+        self._last_preprocessed = None
         
         # 性能统计
         self.ocr_stats = {
@@ -32,53 +244,47 @@ class OCREngine:
             "total_processing_time": 0,
             "average_processing_time": 0,
             "success_count": 0,
-            "error_count": 0
+            "error_count": 0,
+            "cache_hit_count": 0
         }
         
-        # 缓存机制
-        self.image_cache = {}
-        self.cache_max_size = 10
+        # 缓存机制：预处理后图像内容 -> 识别结果（LRU）
+        self.image_cache = OrderedDict()
+        self.cache_max_size = 32
+        self._cache_lock = threading.Lock()
+
+        # 是否使用进程内Tesseract句柄
+        self._use_tesserocr = tesserocr is not None
 
     def set_preprocessing(self, preprocessing):
         """设置预处理配置"""
         self.preprocessing = preprocessing
         # 更新预处理配置
 
-    def preprocess_image(self, image):
-        """对图像进行预处理以提高OCR精度"""
-        # 记录预处理步骤
-        preprocess_steps = []
-
-        # 灰度处理
-        if self.preprocessing.get("grayscale", True):
-            image = image.convert('L')
-            preprocess_steps.append("灰度处理")
-
-        # 反色处理（适用于浅色背景深色文字的情况）
-        if self.preprocessing.get("invert", False):
-            image = ImageOps.invert(image)
-            preprocess_steps.append("反色处理")
-
-        # 二值化处理
-        threshold = self.preprocessing.get("threshold", 0)
-        if threshold > 0:
-            # 简单的二值化处理
-            image = image.point(lambda p: p > threshold and 255)
-            preprocess_steps.append(f"二值化处理(阈值={threshold})")
+    def preprocess_params(self):
+        """当前预处理参数，用作缓存键"""
+        return (tuple(sorted(self.preprocessing.items())), self.contrast_factor)
 
-        # 增强对比度（保守设置）
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(1.2)  # 增强1.2倍对比度
-        preprocess_steps.append("对比度增强(1.2x)")
+    def cached_preprocessed(self, image):
+        """若已按当前参数预处理过该图像则返回结果，否则返回None"""
+        last = self._last_preprocessed
+        if last is not None and last[0] is image and last[1] == self.preprocess_params():
+            return last[2]
+        return None
 
-        # 记录预处理步骤
-        if preprocess_steps:
-            pass  # 图像预处理步骤记录
-
-        return image
+    def preprocess_image(self, image):
+        """对图像进行预处理以提高OCR精度（同一图像和参数直接返回上次结果）"""
+        params = self.preprocess_params()
+        last = self._last_preprocessed
+        if last is not None and last[0] is image and last[1] == params:
+            return last[2]
+        result = preprocess_with_params(image, params)
+        self._last_preprocessed = (image, params, result)
+        return result
 
     @error_handler_decorator("OCR识别")
-    def perform_ocr(self, image, lang=None, progress_callback: Optional[Callable] = None):
+    def perform_ocr(self, image, lang=None, progress_callback: Optional[Callable] = None,
+                    preprocessed: bool = False):
         """执行OCR识别 - 优化版本"""
         start_time = time.time()
         self.ocr_stats["total_ocr_calls"] += 1
@@ -95,18 +301,27 @@ class OCREngine:
         if progress_callback:
             progress_callback(10, "开始OCR识别...")
 
-        # 预处理图像
-        processed_image = self.preprocess_image(image)
+        # 预处理图像（调用方已预处理时直接使用）
+        processed_image = image if preprocessed else self.preprocess_image(image)
         if progress_callback:
             progress_callback(30, "图像预处理完成")
 
         try:
             # 执行OCR
-            result = pytesseract.image_to_string(
-                processed_image,  # 使用预处理后的图像
-                lang=lang,
-                config=config_str
-            )
+            # 同一区域重复截图时直接返回缓存结果
+            cache_key = (_image_digest(processed_image), processed_image.mode, processed_image.size,
+                         lang, self.config['psm'], self.config['oem'])
+            with self._cache_lock:
+                result = self.image_cache.get(cache_key)
+                if result is not None:
+                    self.image_cache.move_to_end(cache_key)
+                    self.ocr_stats["cache_hit_count"] += 1
+            if result is None:
+                result = self._run_tesseract(processed_image, lang, config_str)  # 使用预处理后的图像
+                with self._cache_lock:
+                    self.image_cache[cache_key] = result
+                    if len(self.image_cache) > self.cache_max_size:
+                        self.image_cache.popitem(last=False)
             
             if progress_callback:
                 progress_callback(80, "OCR识别完成")
@@ -142,6 +357,46 @@ class OCREngine:
             self.logger.error(f"OCR处理失败: {str(e)}")
             raise Exception(f"OCR处理失败: {str(e)}")
 
+    def _run_tesseract(self, image, lang, config_str):
+        """执行一次Tesseract识别，优先使用tesserocr，不可用时回退到pytesseract"""
+        if self._use_tesserocr:
+            try:
+                with _borrow_tess_api(os.environ.get('TESSDATA_PREFIX', ''), lang,
+                                      int(self.config['psm']), int(self.config['oem'])) as api:
+                    bpp = _RAW_BYTES_PER_PIXEL.get(image.mode)
+                    if bpp:
+                        # 直接交给Tesseract原始像素，省去SetImage内部的BMP编码与Leptonica解码
+                        width, height = image.size
+                        api.SetImageBytes(image.tobytes(), width, height, bpp, width * bpp)
+                        # 与SetImage经BMP传入时的分辨率保持一致（PIL写BMP默认96dpi）
+                        api.SetSourceResolution(int(image.info.get('dpi', (96, 96))[0]))
+                    else:
+                        api.SetImage(image)
+                    return api.GetUTF8Text()
+            except RuntimeError as e:
+                # 语言包缺失等初始化失败，后续统一走pytesseract
+                self.logger.warning("tesserocr初始化失败，回退到pytesseract: %s", e)
+                self._use_tesserocr = False
+        if image.format is None:
+            # pytesseract默认把内存图像写成PNG临时文件，改用未压缩TIFF省去zlib压缩；
+            # 预处理可能原样返回调用方的图像，因此只在共享像素数据的浅包装上设置格式
+            image.load()
+            image = image._new(image.im)
+            image.format = 'TIFF'
+        return pytesseract.image_to_string(image, lang=lang, config=config_str)
+
+    def warmup(self):
+        """预热Tesseract和预处理流程：加载引擎、语言数据并构建查找表，不计入统计"""
+        blank = Image.new('RGB', (16, 16), 'white')
+        config_str = f'--psm {self.config["psm"]} --oem {self.config["oem"]}'
+        # 走一遍完整预处理，首次截图不再承担查找表构建等一次性开销
+        self._run_tesseract(self.preprocess_image(blank), self.config['language'], config_str)
+
+    def close(self):
+        """释放空闲的进程内Tesseract句柄（句柄析构时调用End）"""
+        with _TESS_POOL_LOCK:
+            _TESS_POOL.clear()
+
     def update_config(self, language, psm, oem):
         """更新OCR配置"""
         self.config['language'] = language
@@ -160,13 +415,17 @@ class OCREngine:
             "total_processing_time": 0,
             "average_processing_time": 0,
             "success_count": 0,
-            "error_count": 0
+            "error_count": 0,
+            "cache_hit_count": 0
         }
         # OCR统计信息已重置
     
     def optimize_for_text_type(self, image, text_type: str = "mixed"):
-        """根据文本类型优化OCR参数"""
-        if text_type == "chinese":
+        """根据文本类型优化OCR参数（零散分布的界面标签可手动使用PSM 11稀疏文本模式）"""
+        if text_type == "ui_screenshot":
+            self.config['psm'] = '6'
+            self.config['oem'] = '1'
+        elif text_type == "chinese":
             self.config['language'] = 'chi_sim'
             self.config['psm'] = '6'
         elif text_type == "english":
@@ -1,46 +1,85 @@
 # performance.py - 简单性能监控模块
+import functools
 import time
 import logging
+import threading
+from collections import Counter, defaultdict, deque
 from typing import Dict, Any
 
+# 历史记录上限，避免长时间运行时无限增长
+HISTORY_MAXLEN = 10_000
+
 class PerformanceMonitor:
     """简单的性能监控器"""
     
     def __init__(self):
         self.logger = logging.getLogger("PerformanceMonitor")
-        self.operation_times = {}
+        # 每个线程各自的计时栈，元素为 (操作名, 开始时间ns)，支持嵌套计时
+        self._tls = threading.local()
+        self._lock = threading.Lock()
         self.start_time = time.time()
-        self.operation_history = []
+        self.operation_history = deque(maxlen=HISTORY_MAXLEN)
+        # 增量统计，get_stats 无需再扫描历史
+        self._counts = Counter()
+        self._durations = defaultdict(float)
+        self._total_duration = 0.0
+        self._total_ops = 0
+    
+    def _timer_stack(self) -> list:
+        """获取当前线程的计时栈"""
+        stack = getattr(self._tls, "stack", None)
+        if stack is None:
+            stack = self._tls.stack = []
+        return stack
     
     def start_timer(self, operation: str):
         """开始计时"""
-        self.operation_times[operation] = time.time()
-        # 开始计时
+        self._timer_stack().append((operation, time.perf_counter_ns()))
     
     def end_timer(self, operation: str) -> float:
         """结束计时并返回耗时"""
-        if operation not in self.operation_times:
-            self.logger.warning(f"未找到开始时间: {operation}")
+        stack = self._timer_stack()
+        # 正常嵌套时就是栈顶；否则向下查找同名计时
+        for i in range(len(stack) - 1, -1, -1):
+            if stack[i][0] == operation:
+                t0 = stack.pop(i)[1]
+                break
+        else:
+            self.logger.warning("未找到开始时间: %s", operation)
             return 0.0
         
-        elapsed = time.time() - self.operation_times[operation]
-        del self.operation_times[operation]
-        
-        # 记录操作历史
-        self.operation_history.append({
-            "operation": operation,
-            "duration": elapsed,
-            "timestamp": time.time()
-        })
-        
-        # 操作完成
-        return elapsed
+        ns_elapsed = time.perf_counter_ns() - t0
+        self.record(operation, ns_elapsed)
+        return ns_elapsed / 1e9
+    
+    def record(self, operation: str, ns_elapsed: int):
+        """记录一次已完成操作的耗时（纳秒）"""
+        elapsed = ns_elapsed / 1e9
+        with self._lock:
+            self.operation_history.append({
+                "operation": operation,
+                "duration": elapsed,
+                "timestamp": time.time()
+            })
+            self._counts[operation] += 1
+            self._durations[operation] += elapsed
+            self._total_duration += elapsed
+            self._total_ops += 1
+    
+    def reset_stats(self):
+        """重置统计信息"""
+        with self._lock:
+            self.operation_history.clear()
+            self._counts.clear()
+            self._durations.clear()
+            self._total_duration = 0.0
+            self._total_ops = 0
     
     def get_operation_stats(self) -> Dict[str, Any]:
         """获取操作统计信息"""
         return {
-            "monitored_operations": list(self.operation_times.keys()),
-            "active_operations": len(self.operation_times)
+            "monitored_operations": [name for name, _ in self._timer_stack()],
+            "active_operations": len(self._timer_stack())
         }
     
     def get_stats(self) -> Dict[str, Any]:
@@ -48,45 +87,42 @@ class PerformanceMonitor:
         current_time = time.time()
         total_runtime = current_time - self.start_time
         
-        # 计算操作统计
-        total_operations = len(self.operation_history)
-        if total_operations > 0:
-            total_duration = sum(op["duration"] for op in self.operation_history)
-            avg_duration = total_duration / total_operations
-        else:
-            total_duration = 0.0
-            avg_duration = 0.0
-        
-        # 按操作类型分组统计
-        operation_counts = {}
-        operation_times = {}
-        for op in self.operation_history:
-            op_name = op["operation"]
-            operation_counts[op_name] = operation_counts.get(op_name, 0) + 1
-            operation_times[op_name] = operation_times.get(op_name, 0.0) + op["duration"]
+        # 在锁内一并取快照，避免与其他线程的 record 交错
+        with self._lock:
+            total_operations = self._total_ops
+            total_duration = self._total_duration
+            operation_counts = dict(self._counts)
+            operation_times = dict(self._durations)
+        avg_duration = total_duration / total_operations if total_operations else 0.0
         
         return {
             "total_runtime": total_runtime,
             "total_operations": total_operations,
             "total_duration": total_duration,
             "average_duration": avg_duration,
-            "active_operations": len(self.operation_times),
+            "active_operations": len(self._timer_stack()),
             "operation_counts": operation_counts,
             "operation_times": operation_times,
             "start_time": self.start_time,
             "current_time": current_time
         }
 
+# 装饰器共用的监控器，避免每次调用都新建实例
+_MONITOR = PerformanceMonitor()
+
+def get_monitor() -> PerformanceMonitor:
+    """获取全局性能监控器（time_operation装饰器记录到同一实例）"""
+    return _MONITOR
+
 def time_operation(operation_name: str):
     """性能监控装饰器"""
     def decorator(func):
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            monitor = PerformanceMonitor()
-            monitor.start_timer(operation_name)
+            t0 = time.perf_counter_ns()
             try:
-                result = func(*args, **kwargs)
-                return result
+                return func(*args, **kwargs)
             finally:
-                monitor.end_timer(operation_name)
+                _MONITOR.record(operation_name, time.perf_counter_ns() - t0)
         return wrapper
     return decorator
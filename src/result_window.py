@@ -1,7 +1,9 @@
 # result_window.py - 结果窗口功能
 import tkinter as tk
 from tkinter import messagebox, filedialog, ttk
-from PIL import Image, ImageTk, ImageOps, ImageEnhance
+from PIL import Image, ImageTk
+from ocr_engine import is_scale_sensitive, preprocess_with_params
+import functools
 import re
 import socket
 import threading
@@ -9,6 +11,152 @@ import time
 import logging
 import sys
 import os
+from collections import OrderedDict
+
+# 可选：NumPy批量统计字符码位，长文本的语言检测快两个数量级
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 英文单词（预编译，只需判断是否存在）
+_ENG_WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+
+# 语言检测统计的文字区段：(名称, 起始码位, 结束码位)
+_SCRIPT_RANGES = (
+    ("chinese", 0x4E00, 0x9FFF),
+    ("hiragana", 0x3040, 0x309F),
+    ("katakana", 0x30A0, 0x30FF),
+    ("korean", 0xAC00, 0xD7AF),
+    ("arabic", 0x0600, 0x06FF),
+    ("cyrillic", 0x0400, 0x04FF),
+    ("latin", 0x00C0, 0x017F),
+)
+
+# 无NumPy时的分类标记：各区段字符映射为私用区的一个标记字符
+_SCRIPT_MARKS = tuple(chr(0xE000 + i) for i in range(len(_SCRIPT_RANGES)))
+
+@functools.lru_cache(maxsize=1)
+def _script_table():
+    """str.translate用的分类表：区段内字符 -> 区段标记，原有的标记字符删除（首次使用时构建）"""
+    table = {ord(mark): None for mark in _SCRIPT_MARKS}
+    for mark, (_, lo, hi) in zip(_SCRIPT_MARKS, _SCRIPT_RANGES):
+        table.update(dict.fromkeys(range(lo, hi + 1), mark))
+    return table
+
+def _count_scripts(text):
+    """统计文本中各文字区段的字符数"""
+    if np is not None:
+        # 编码一次，按码位区间做向量化比较
+        codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        return {name: int(np.count_nonzero((codes >= lo) & (codes <= hi)))
+                for name, lo, hi in _SCRIPT_RANGES}
+    # 一次translate完成全部字符分类，再用C实现的str.count逐区段计数
+    marked = text.translate(_script_table())
+    return {name: marked.count(mark)
+            for mark, (name, _, _) in zip(_SCRIPT_MARKS, _SCRIPT_RANGES)}
+
+# 语言检测抽样：超过此长度的文本先检查开头一段
+_DETECT_SAMPLE_MIN_LEN = 1024
+_DETECT_SAMPLE_SIZE = 256
+_CHINESE_RE = re.compile('[\u4e00-\u9fff]')
+
+@functools.lru_cache(maxsize=16)
+def _detect_language(text):
+    """检测文本的主要语言（按文本缓存：载入时自动检测与翻译时检测通常是同一段文本）"""
+    # 简单的语言检测：检查中文字符比例
+    total_chars = len(text)
+    if total_chars == 0:
+        return "unknown"
+
+    # 长文本先抽查开头：中文占绝对多数时只需再统计全文中文比例确认，免去各区段的整段统计
+    # （开头只是预判，标题为中文、正文为英文的文本仍按全文比例判定）
+    if total_chars > _DETECT_SAMPLE_MIN_LEN:
+        sample = text[:_DETECT_SAMPLE_SIZE]
+        if (_CHINESE_RE.subn('', sample)[1] > 0.5 * len(sample)
+                and _CHINESE_RE.subn('', text)[1] > 0.3 * total_chars):
+            return "chinese"
+
+    # 统计各文字区段的字符数量
+    counts = _count_scripts(text)
+    chinese_ratio = counts["chinese"] / total_chars
+
+    # 如果中文字符超过30%，则认为是中文
+    if chinese_ratio > 0.3:
+        return "chinese"
+
+    # 检查其他语言特征
+    # 日文平假名和片假名
+    japanese_ratio = (counts["hiragana"] + counts["katakana"]) / total_chars
+    
+    # 韩文
+    korean_ratio = counts["korean"] / total_chars
+    
+    # 阿拉伯文
+    arabic_ratio = counts["arabic"] / total_chars
+    
+    # 俄文
+    cyrillic_ratio = counts["cyrillic"] / total_chars
+    
+    # 法文、德文、西班牙文等拉丁语系
+    latin_ratio = counts["latin"] / total_chars
+    
+    # 判断语言类型
+    if japanese_ratio > 0.1:
+        return "japanese"
+    elif korean_ratio > 0.1:
+        return "korean"
+    elif arabic_ratio > 0.1:
+        return "arabic"
+    elif cyrillic_ratio > 0.1:
+        return "russian"
+    # 英文单词只需知道是否存在，放在最后按需检查
+    elif latin_ratio > 0.1 or _ENG_WORD_RE.search(text) is not None:
+        return "other_latin"  # 包括英文、法文、德文、西班牙文等
+    else:
+        return "unknown"
+
+# 网络检测结果缓存，所有结果窗口共享：只有连通结果在有效期内复用，不通时每次重新探测
+_NET_STATUS = {"ok": None, "ts": 0.0}
+NET_STATUS_TTL = 30.0
+
+# 支持的翻译语言：(显示名称, 语言代码)，首项为"自动检测"
+SUPPORTED_LANGUAGES = (
+    ("自动检测", "auto"),
+    ("中文", "zh"),
+    ("英文", "en"),
+    ("日文", "ja"),
+    ("韩文", "ko"),
+    ("法文", "fr"),
+    ("德文", "de"),
+    ("西班牙文", "es"),
+    ("俄文", "ru"),
+    ("阿拉伯文", "ar"),
+    ("意大利文", "it"),
+    ("葡萄牙文", "pt"),
+    ("荷兰文", "nl"),
+    ("瑞典文", "sv"),
+    ("挪威文", "no"),
+    ("丹麦文", "da"),
+    ("芬兰文", "fi"),
+    ("波兰文", "pl"),
+    ("捷克文", "cs"),
+    ("匈牙利文", "hu"),
+    ("希腊文", "el"),
+    ("土耳其文", "tr"),
+    ("希伯来文", "he"),
+    ("泰文", "th"),
+    ("越南文", "vi"),
+    ("印尼文", "id"),
+    ("马来文", "ms"),
+    ("印地文", "hi"),
+    ("乌尔都文", "ur"),
+    ("波斯文", "fa"),
+)
+LANG_NAMES = tuple(name for name, _ in SUPPORTED_LANGUAGES)
+TARGET_LANG_NAMES = LANG_NAMES[1:]  # 目标语言不包含"自动检测"
+LANG_CODE_MAP = dict(SUPPORTED_LANGUAGES)
+LANG_NAME_TO_INDEX = {name: i for i, name in enumerate(LANG_NAMES)}
 
 def resource_path(relative_path):
     """获取资源绝对路径，支持开发环境和PyInstaller打包环境"""
@@ -30,8 +178,14 @@ class ResultWindow:
 
         self.master = master
         self.app = app  # 保存应用实例引用
+        # 应用提供的功能在窗口生命周期内不变，创建时解析一次
+        self._cb_show_stats = getattr(app, 'show_stats', None)
+        self._cb_show_settings = getattr(app, 'show_settings', None)
+        self._advanced_cache = getattr(app, 'advanced_cache', None)
         self.recapture_callback = recapture_callback
         self.window = tk.Toplevel(master)
+        # 构建界面期间先隐藏窗口，控件全部创建后只做一次布局和绘制
+        self.window.withdraw()
         self.window.title("OCR识别结果")
         self.window.geometry("800x600")
         self.window.minsize(600, 500)
@@ -45,20 +199,56 @@ class ResultWindow:
         self.translation_start_time = 0  # 记录翻译开始时间
         self.last_update_time = 0  # 记录上次更新UI的时间
         self.original_ocr_text = ocr_result  # 保存原始OCR文本
+        # 预览缓存：同一截图只缩放一次，预处理结果按设置缓存（截图变化时清空）
+        self._preview_source = None  # 缓存对应的截图
+        self._preview_base = None  # 缩放后的原图预览
+        self._preview_cache = OrderedDict()  # 预处理设置 -> 预处理后的预览图
+        self._preview_shown = None  # 当前显示的预处理设置
+        self._preview_pending = None  # 正在后台生成的预处理设置
+        self._photo_cache = {}  # id(预览图) -> (预览图, PhotoImage)
+        # 历史记录列表：行键 -> Treeview条目，用于增量更新
+        self._history_rows = {}
+        self._history_last_refresh = 0.0
+        # 编辑和详情窗口创建后隐藏复用
+        self._edit_window = None
+        self._detail_window = None
+
+        # 后台预先探测网络，首次点击翻译时通常已有缓存结果
+        if not self._network_status_fresh():
+            threading.Thread(target=self.check_network_connection, daemon=True).start()
+
+        # 强调按钮样式只配置一次，避免每个标签页重复修改样式数据库
+        ttk.Style(self.window).configure("Accent.TButton", foreground="white", background="#4CAF50",
+                                         font=("微软雅黑", 10, "bold"))
 
-        # 创建UI
-        self._create_ui()
+        try:
+            # 创建UI
+            self._create_ui()
 
-        # 如果有初始结果，显示它
-        if ocr_result:
-            self.display_result(ocr_result, screenshot)
+            # 如果有初始结果，显示它
+            if ocr_result:
+                self.display_result(ocr_result, screenshot)
+        finally:
+            self.window.deiconify()
 
         # 结果窗口初始化完成
 
+    @property
+    def ocr_result(self):
+        """当前OCR结果文本"""
+        return self._ocr_result
+
+    @ocr_result.setter
+    def ocr_result(self, text):
+        """设置OCR结果，同时缓存历史记录用的文本预览"""
+        self._ocr_result = text
+        self._ocr_preview = text[:50] + "..." if len(text) > 50 else text
+
     def on_close(self):
         """处理窗口关闭事件"""
         # 关闭结果窗口
         self.translation_in_progress = False  # 停止翻译
+        self._photo_cache.clear()
         
         # 检查窗口是否还存在，避免重复销毁
         try:
@@ -82,14 +272,27 @@ class ResultWindow:
             messagebox.showwarning("警告", "重新截图功能不可用")
 
     def edit_text(self):
-        """编辑OCR文本"""
-        # 编辑OCR文本
-        
-        # 创建编辑窗口
+        """编辑OCR文本（编辑窗口只创建一次，之后隐藏/显示复用）"""
+        if self._edit_window is None or not self._edit_window.winfo_exists():
+            self._create_edit_window()
+
+        # 填入当前文本，并清除修改标志以便保存时判断是否真的编辑过
+        self._set_text(self._edit_text_editor, self.ocr_result)
+        self._edit_text_editor.edit_modified(False)
+
+        self._edit_window.deiconify()
+        self._edit_window.lift()
+        self._edit_text_editor.focus_set()
+
+    def _create_edit_window(self):
+        """创建（隐藏的）文本编辑窗口"""
         edit_window = tk.Toplevel(self.window)
+        edit_window.withdraw()
         edit_window.title("编辑识别文本")
         edit_window.geometry("600x400")
         edit_window.transient(self.window)
+        # 关闭时隐藏而非销毁，下次直接复用
+        edit_window.protocol("WM_DELETE_WINDOW", edit_window.withdraw)
         
         # 创建主框架
         main_frame = ttk.Frame(edit_window, padding=20)
@@ -110,95 +313,107 @@ class ResultWindow:
         text_editor = tk.Text(text_frame, wrap=tk.WORD, font=("微软雅黑", 11))
         text_editor.pack(fill=tk.BOTH, expand=True)
         
-        # 插入当前文本
-        text_editor.insert(1.0, self.ocr_result)
-        
         # 按钮框架
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X)
         
-        def save_edited_text():
-            """保存编辑后的文本"""
-            edited_text = text_editor.get(1.0, tk.END).strip()
-            if edited_text != self.ocr_result:
-                self.ocr_result = edited_text
-                # 更新显示
-                if hasattr(self, 'text_area'):
-                    self.text_area.config(state=tk.NORMAL)
-                    self.text_area.delete(1.0, tk.END)
-                    self.text_area.insert(1.0, edited_text)
-                    self.text_area.config(state=tk.DISABLED)
-                
-                # 更新应用中的结果
-                if self.app:
-                    self.app.ocr_result = edited_text
-                    self.app.last_action.set(f"最近操作: 编辑了 {len(edited_text)} 个字符")
-                
-                # 文本已编辑
-                messagebox.showinfo("成功", "文本已更新")
-            
-            edit_window.destroy()
-        
         ttk.Button(
             button_frame,
             text="保存",
-            command=save_edited_text
+            command=self._save_edited_text
         ).pack(side=tk.LEFT, padx=5)
         
         ttk.Button(
             button_frame,
             text="取消",
-            command=edit_window.destroy
+            command=edit_window.withdraw
         ).pack(side=tk.RIGHT, padx=5)
 
+        self._edit_window = edit_window
+        self._edit_text_editor = text_editor
+
+    def _save_edited_text(self):
+        """保存编辑后的文本"""
+        text_editor = self._edit_text_editor
+        if not text_editor.edit_modified():
+            # 未做任何编辑，无需读取和比较整段文本
+            self._edit_window.withdraw()
+            return
+        edited_text = text_editor.get(1.0, tk.END).strip()
+        if edited_text != self.ocr_result:
+            self.ocr_result = edited_text
+            # 更新显示
+            if hasattr(self, 'text_area'):
+                self._set_text(self.text_area, edited_text, tk.DISABLED)
+            
+            # 更新应用中的结果
+            if self.app:
+                self.app.ocr_result = edited_text
+                self.app.last_action.set(f"最近操作: 编辑了 {len(edited_text)} 个字符")
+            
+            # 文本已编辑
+            messagebox.showinfo("成功", "文本已更新")
+        
+        self._edit_window.withdraw()
+
     def show_stats(self):
         """显示统计信息"""
-        if self.app and hasattr(self.app, 'show_stats'):
-            self.app.show_stats()
+        if self._cb_show_stats:
+            self._cb_show_stats()
 
     def show_settings(self):
         """显示设置窗口"""
-        if self.app and hasattr(self.app, 'show_settings'):
-            self.app.show_settings()
+        if self._cb_show_settings:
+            self._cb_show_settings()
 
     def load_history(self):
-        """加载历史记录"""
+        """加载历史记录（只增删有变化的行，不重建整个列表）"""
         try:
-            # 清空现有记录
-            for item in self.history_tree.get_children():
-                self.history_tree.delete(item)
-            
+            # 目标行，自上而下排列；键不含时间戳，未变化的行保持原样
+            rows = []
+
+            # 添加当前结果到历史记录
+            if self.ocr_result:
+                ocr_len, preview = len(self.ocr_result), self._ocr_preview
+                rows.append((("result", ocr_len, preview), (ocr_len, preview)))
+
             # 从缓存中加载历史记录
-            if self.app and hasattr(self.app, 'advanced_cache'):
-                cache_stats = self.app.advanced_cache.get_stats()
+            if self._advanced_cache is not None:
+                cache_stats = self._advanced_cache.get_stats()
                 # 这里可以扩展为从文件或数据库加载历史记录
                 # 目前显示缓存统计信息
-                if cache_stats.get('total_requests', 0) > 0:
-                    self.history_tree.insert("", 0, values=(
-                        time.strftime('%Y-%m-%d %H:%M:%S'),
-                        "缓存",
-                        f"总请求: {cache_stats.get('total_requests', 0)}"
-                    ))
-            
-            # 添加当前结果到历史记录
-            if self.ocr_result:
-                preview = self.ocr_result[:50] + "..." if len(self.ocr_result) > 50 else self.ocr_result
-                self.history_tree.insert("", 0, values=(
-                    time.strftime('%Y-%m-%d %H:%M:%S'),
-                    len(self.ocr_result),
-                    preview
-                ))
-                
+                total_requests = cache_stats.get('total_requests', 0)
+                if total_requests > 0:
+                    rows.append((("cache", total_requests), ("缓存", f"总请求: {total_requests}")))
+
+            wanted = {key for key, _ in rows}
+            stale = [key for key in self._history_rows if key not in wanted]
+            if stale:
+                self.history_tree.delete(*(self._history_rows.pop(key) for key in stale))
+
+            # 时间戳只在确有新行插入时格式化一次
+            timestamp = None
+            for index, (key, values) in enumerate(rows):
+                if key not in self._history_rows:
+                    if timestamp is None:
+                        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+                    self._history_rows[key] = self.history_tree.insert("", index, values=(timestamp,) + values)
+
         except Exception as e:
             self.logger.error(f"加载历史记录失败: {str(e)}")
 
     def refresh_history(self):
         """刷新历史记录"""
+        # 连续点击时忽略间隔过短的刷新
+        now = time.monotonic()
+        if now - self._history_last_refresh < 0.2:
+            return
+        self._history_last_refresh = now
         self.load_history()
         messagebox.showinfo("刷新", "历史记录已刷新")
 
     def view_history_detail(self):
-        """查看历史记录详情"""
+        """查看历史记录详情（详情窗口只创建一次，之后隐藏/显示复用）"""
         selection = self.history_tree.selection()
         if not selection:
             messagebox.showwarning("提示", "请选择一条历史记录")
@@ -206,12 +421,27 @@ class ResultWindow:
         
         item = self.history_tree.item(selection[0])
         values = item['values']
-        
-        # 创建详情窗口
+
+        if self._detail_window is None or not self._detail_window.winfo_exists():
+            self._create_detail_window()
+
+        self._detail_time_label.config(text=f"识别时间: {values[0]}")
+        self._detail_count_label.config(text=f"字符数: {values[1]}")
+        # 显示当前OCR结果
+        self._set_text(self._detail_text, self.ocr_result, tk.DISABLED)
+
+        self._detail_window.deiconify()
+        self._detail_window.lift()
+
+    def _create_detail_window(self):
+        """创建（隐藏的）历史记录详情窗口"""
         detail_window = tk.Toplevel(self.window)
+        detail_window.withdraw()
         detail_window.title("历史记录详情")
         detail_window.geometry("600x400")
         detail_window.transient(self.window)
+        # 关闭时隐藏而非销毁，下次直接复用
+        detail_window.protocol("WM_DELETE_WINDOW", detail_window.withdraw)
         
         # 创建主框架
         main_frame = ttk.Frame(detail_window, padding=20)
@@ -228,20 +458,18 @@ class ResultWindow:
         info_frame = ttk.LabelFrame(main_frame, text="记录信息", padding=10)
         info_frame.pack(fill=tk.X, pady=(0, 15))
         
-        ttk.Label(info_frame, text=f"识别时间: {values[0]}").pack(anchor=tk.W)
-        ttk.Label(info_frame, text=f"字符数: {values[1]}").pack(anchor=tk.W)
+        self._detail_time_label = ttk.Label(info_frame)
+        self._detail_time_label.pack(anchor=tk.W)
+        self._detail_count_label = ttk.Label(info_frame)
+        self._detail_count_label.pack(anchor=tk.W)
         
         # 内容框架
         content_frame = ttk.LabelFrame(main_frame, text="识别内容", padding=10)
         content_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
         
         # 文本显示区域
-        text_display = tk.Text(content_frame, wrap=tk.WORD, font=("微软雅黑", 11))
-        text_display.pack(fill=tk.BOTH, expand=True)
-        
-        # 显示当前OCR结果
-        text_display.insert(1.0, self.ocr_result)
-        text_display.config(state=tk.DISABLED)
+        self._detail_text = tk.Text(content_frame, wrap=tk.WORD, font=("微软雅黑", 11))
+        self._detail_text.pack(fill=tk.BOTH, expand=True)
         
         # 按钮框架
         button_frame = ttk.Frame(main_frame)
@@ -250,19 +478,21 @@ class ResultWindow:
         ttk.Button(
             button_frame,
             text="关闭",
-            command=detail_window.destroy
+            command=detail_window.withdraw
         ).pack(side=tk.RIGHT, padx=5)
 
+        self._detail_window = detail_window
+
     def clear_history(self):
         """清除历史记录"""
         if messagebox.askyesno("确认清除", "确定要清除所有历史记录吗？"):
             # 清空Treeview
-            for item in self.history_tree.get_children():
-                self.history_tree.delete(item)
+            self.history_tree.delete(*self.history_tree.get_children())
+            self._history_rows.clear()
             
             # 清除缓存统计
-            if self.app and hasattr(self.app, 'advanced_cache'):
-                self.app.advanced_cache.clear_stats()
+            if self._advanced_cache is not None:
+                self._advanced_cache.clear_stats()
             
             messagebox.showinfo("成功", "历史记录已清除")
 
@@ -273,18 +503,22 @@ class ResultWindow:
 
         self.notebook = ttk.Notebook(main_frame)
         self.notebook.pack(fill=tk.BOTH, expand=True)
+        self._tab_frames = {}  # 标签页名称 -> 标签页框架
 
         # 识别结果标签页
         self.create_result_tab()
 
-        # 截图预览标签页
-        self.create_image_tab()
+        # 截图预览、历史记录标签页在首次切换到时才创建控件；
+        # 翻译标签页在显示结果时总会被选中，直接创建
+        self._tab_builders = {}
+        self._add_lazy_tab("image", "截图预览", self.create_image_tab)
 
         # 翻译标签页
         self.create_translation_tab()
         
         # 历史记录标签页
-        self.create_history_tab()
+        self._add_lazy_tab("history", "历史记录", self.create_history_tab)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_shown)
 
         # 按钮框架
         button_frame = ttk.Frame(main_frame)
@@ -333,6 +567,7 @@ class ResultWindow:
     def create_result_tab(self):
         """创建识别结果标签页"""
         result_frame = ttk.Frame(self.notebook, padding=10)
+        self._tab_frames["result"] = result_frame
         self.notebook.add(result_frame, text="识别结果")
 
         scrollbar = ttk.Scrollbar(result_frame)
@@ -354,9 +589,6 @@ class ResultWindow:
         translate_btn_frame = ttk.Frame(result_frame)
         translate_btn_frame.pack(fill=tk.X, pady=5)
 
-        # 为翻译按钮添加特殊样式
-        style = ttk.Style()
-        style.configure("Accent.TButton", foreground="white", background="#4CAF50", font=("微软雅黑", 10, "bold"))
         ttk.Button(
             translate_btn_frame,
             text="翻译此文本",
@@ -380,16 +612,33 @@ class ResultWindow:
         if text_to_translate:
             self.translate_input.delete(1.0, tk.END)
             self.translate_input.insert(tk.END, text_to_translate)
-            self.notebook.select(2)  # 切换到翻译标签页
+            self._select_tab("translation")  # 切换到翻译标签页
             self.translate_text()
         else:
             self.logger.warning("尝试翻译空文本")
 
-    def create_image_tab(self):
+    def _add_lazy_tab(self, name, text, builder):
+        """添加占位标签页，首次切换到该页时才调用builder创建其中的控件"""
+        frame = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(frame, text=text)
+        self._tab_frames[name] = frame
+        self._tab_builders[str(frame)] = (builder, frame)
+
+    def _select_tab(self, name):
+        """按名称切换标签页，已是当前页时不做任何操作"""
+        frame = self._tab_frames[name]
+        if self.notebook.select() != str(frame):
+            self.notebook.select(frame)
+
+    def _on_tab_shown(self, event=None):
+        """标签页切换时构建尚未创建的标签页（只执行一次）"""
+        entry = self._tab_builders.pop(self.notebook.select(), None)
+        if entry is not None:
+            builder, frame = entry
+            builder(frame)
+
+    def create_image_tab(self, image_frame):
         """创建截图预览标签页"""
-        image_frame = ttk.Frame(self.notebook, padding=10)
-        self.notebook.add(image_frame, text="截图预览")
-
         # 创建选项卡容器
         image_notebook = ttk.Notebook(image_frame)
         image_notebook.pack(fill=tk.BOTH, expand=True)
@@ -416,9 +665,14 @@ class ResultWindow:
             foreground="#666666"
         ).pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
 
+        # 显示已在后台生成（或尚待生成）的预览
+        if self.current_screenshot:
+            self.update_image_preview()
+
     def create_translation_tab(self):
         """创建翻译标签页"""
         translation_frame = ttk.Frame(self.notebook, padding=10)
+        self._tab_frames["translation"] = translation_frame
         self.notebook.add(translation_frame, text="翻译")
 
         # 输入框区域
@@ -463,50 +717,14 @@ class ResultWindow:
             state="readonly"
         )
         
-        # 定义支持的语言
-        self.supported_languages = [
-            ("自动检测", "auto"),
-            ("中文", "zh"),
-            ("英文", "en"),
-            ("日文", "ja"),
-            ("韩文", "ko"),
-            ("法文", "fr"),
-            ("德文", "de"),
-            ("西班牙文", "es"),
-            ("俄文", "ru"),
-            ("阿拉伯文", "ar"),
-            ("意大利文", "it"),
-            ("葡萄牙文", "pt"),
-            ("荷兰文", "nl"),
-            ("瑞典文", "sv"),
-            ("挪威文", "no"),
-            ("丹麦文", "da"),
-            ("芬兰文", "fi"),
-            ("波兰文", "pl"),
-            ("捷克文", "cs"),
-            ("匈牙利文", "hu"),
-            ("希腊文", "el"),
-            ("土耳其文", "tr"),
-            ("希伯来文", "he"),
-            ("泰文", "th"),
-            ("越南文", "vi"),
-            ("印尼文", "id"),
-            ("马来文", "ms"),
-            ("印地文", "hi"),
-            ("乌尔都文", "ur"),
-            ("波斯文", "fa")
-        ]
         
         # 设置下拉框选项
-        source_combo['values'] = [lang[0] for lang in self.supported_languages]
-        target_combo['values'] = [lang[0] for lang in self.supported_languages[1:]]  # 目标语言不包含"自动检测"
+        source_combo['values'] = LANG_NAMES
+        target_combo['values'] = TARGET_LANG_NAMES
         
         source_combo.pack(side=tk.LEFT, padx=(0, 5))
         target_combo.pack(side=tk.LEFT, padx=(0, 5))
         
-        # 语言代码映射
-        self.lang_code_mapping = {lang[0]: lang[1] for lang in self.supported_languages}
-        
         # 绑定语言选择变化事件
         source_combo.bind('<<ComboboxSelected>>', self._on_language_changed)
         target_combo.bind('<<ComboboxSelected>>', self._on_language_changed)
@@ -515,10 +733,6 @@ class ResultWindow:
         btn_frame = ttk.Frame(translation_frame)
         btn_frame.pack(fill=tk.X, pady=5)
 
-        # 为翻译按钮添加特殊样式
-        style = ttk.Style()
-        style.configure("Accent.TButton", foreground="white", background="#4CAF50", font=("微软雅黑", 10, "bold"))
-        
         self.translate_btn = ttk.Button(
             btn_frame,
             text="翻译",
@@ -588,10 +802,10 @@ class ResultWindow:
         # 如果源语言和目标语言相同，自动调整目标语言
         if source_lang == target_lang and source_lang != "自动检测":
             # 找到当前源语言的索引
-            source_index = next(i for i, (name, code) in enumerate(self.supported_languages) if name == source_lang)
+            source_index = LANG_NAME_TO_INDEX[source_lang]
             # 选择下一个不同的语言作为目标语言
-            next_index = (source_index + 1) % len(self.supported_languages[1:])  # 跳过"自动检测"
-            self.target_lang_var.set(self.supported_languages[1:][next_index][0])
+            next_index = (source_index + 1) % len(TARGET_LANG_NAMES)  # 跳过"自动检测"
+            self.target_lang_var.set(TARGET_LANG_NAMES[next_index])
         
         self.logger.debug(f"语言选择更新: {source_lang} → {self.target_lang_var.get()}")
 
@@ -725,7 +939,7 @@ class ResultWindow:
             width=20,
             state="readonly"
         )
-        source_combo['values'] = [lang[0] for lang in self.supported_languages]
+        source_combo['values'] = LANG_NAMES
         source_combo.pack(side=tk.LEFT)
         
         # 目标语言选择
@@ -739,7 +953,7 @@ class ResultWindow:
             width=20,
             state="readonly"
         )
-        target_combo['values'] = [lang[0] for lang in self.supported_languages[1:]]  # 跳过"自动检测"
+        target_combo['values'] = TARGET_LANG_NAMES  # 跳过"自动检测"
         target_combo.pack(side=tk.LEFT)
         
         # 按钮区域
@@ -767,11 +981,8 @@ class ResultWindow:
         # 设置焦点
         source_combo.focus_set()
 
-    def create_history_tab(self):
+    def create_history_tab(self, history_frame):
         """创建历史记录标签页"""
-        history_frame = ttk.Frame(self.notebook, padding=10)
-        self.notebook.add(history_frame, text="历史记录")
-
         # 历史记录列表框架
         list_frame = ttk.LabelFrame(history_frame, text="识别历史", padding=10)
         list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
@@ -839,21 +1050,20 @@ class ResultWindow:
         # 保存原始OCR文本
         self.original_ocr_text = text
 
+        # 去除首尾空白一次，三处共用同一字符串（无空白时strip直接返回原对象）
+        stripped = text.strip()
+
         # 在识别结果标签页显示文本
-        self.text_area.config(state=tk.NORMAL)
-        self.text_area.delete(1.0, tk.END)
-        self.text_area.insert(tk.END, text.strip())
-        self.text_area.config(state=tk.NORMAL)
+        self._set_text(self.text_area, stripped, tk.NORMAL)
 
         # 在翻译标签页的输入框中显示文本
-        self.translate_input.delete(1.0, tk.END)
-        self.translate_input.insert(tk.END, text.strip())
+        self._set_text(self.translate_input, stripped)
         
         # 自动检测语言并设置目标语言
-        self._auto_detect_and_set_target_language(text.strip())
+        self._auto_detect_and_set_target_language(stripped)
         
         # 自动跳转到翻译标签页
-        self.notebook.select(2)  # 切换到翻译标签页（索引2）
+        self._select_tab("translation")
 
         # 更新图像预览
         self.update_image_preview()
@@ -864,68 +1074,149 @@ class ResultWindow:
     def clear_translation_output(self):
         """清除翻译结果"""
         self.logger.debug("清除翻译结果")
-        self.translate_output.config(state=tk.NORMAL)
-        self.translate_output.delete(1.0, tk.END)
-        self.translate_output.config(state=tk.DISABLED)
+        self._set_text(self.translate_output, "", tk.DISABLED)
         self.window.title("OCR识别结果")
 
+    def _set_text(self, widget, text, state=None):
+        """替换Text控件内容：只删除并重写与原内容不同的尾部，state为None时保持原状态"""
+        old = widget.get("1.0", "end-1c")
+        current_state = str(widget.cget("state"))
+        if old != text:
+            common = len(os.path.commonprefix((old, text)))
+            # Tk 8.6按UTF-16计数字符，前缀含BMP以外字符时偏移不可靠，改为整体替换
+            if len(old[:common].encode("utf-16-le")) != 2 * common:
+                common = 0
+            if current_state != tk.NORMAL:
+                widget.config(state=tk.NORMAL)
+            widget.delete(f"1.0+{common}c", tk.END)
+            widget.insert(tk.END, text[common:])
+            if state is None and current_state != tk.NORMAL:
+                widget.config(state=current_state)
+        if state is not None and str(widget.cget("state")) != state:
+            widget.config(state=state)
+
     def update_image_preview(self):
-        """更新图像预览"""
-        if self.current_screenshot:
-            try:
-                # 直接使用当前截图
-                image = self.current_screenshot
+        """更新图像预览（缩放与预处理在后台线程完成，Tk线程只负责显示）"""
+        if not self.current_screenshot:
+            self.logger.warning("没有可用的截图用于预览")
+            return
 
-                # 创建图像的副本，避免修改原始图像
-                image_copy = image.copy()
+        # 直接使用当前截图
+        image = self.current_screenshot
+        if self._preview_source is not image:
+            # 新截图：清空缓存，原图预览需重新缩放
+            self._preview_source = image
+            self._preview_base = None
+            self._preview_cache.clear()
+            self._preview_shown = None
+            self._preview_pending = None
+            self._photo_cache.clear()
+
+        # 以引擎实际使用的参数为键（含对比度系数），与识别输入保持一致
+        settings_key = self.app.ocr_engine.preprocess_params()
+        if settings_key == self._preview_shown or settings_key == self._preview_pending:
+            # 当前显示已是最新，或同样的预览正在后台生成
+            return
 
-                width, height = image_copy.size
+        processed_img = self._preview_cache.get(settings_key)
+        if processed_img is not None and self._preview_base is not None:
+            self._preview_cache.move_to_end(settings_key)
+            self._install_preview_images(image, settings_key, self._preview_base, processed_img)
+            return
+
+        self._preview_pending = settings_key
+        threading.Thread(target=self._compute_preview_images,
+                         args=(image, settings_key, self._preview_base), daemon=True).start()
+
+    def _compute_preview_images(self, image, settings_key, base):
+        """后台线程：生成缩放后的原图与预处理预览（只做PIL运算，不触碰Tk）"""
+        try:
+            if base is None:
+                # resize本身返回新图像，无需先整图复制；小图只读共享原截图
+                width, height = image.size
                 max_size = 600
                 if width > max_size or height > max_size:
                     ratio = min(max_size/width, max_size/height)
                     new_size = (int(width * ratio), int(height * ratio))
-                    preview_img = image_copy.resize(new_size, Image.LANCZOS)
+                    # 大比例缩小时先做整数倍盒式降采样，再对小图做Lanczos
+                    base = image.resize(new_size, Image.LANCZOS, reducing_gap=3.0)
                 else:
-                    preview_img = image_copy
-
-                # 显示原始图像
-                tk_img = ImageTk.PhotoImage(preview_img)
-                self.original_img_label.configure(image=tk_img)
-                self.original_img_label.image = tk_img
-
-                # 显示预处理后的图像
-                processed_img = self.preprocess_image(preview_img)
-                tk_processed_img = ImageTk.PhotoImage(processed_img)
-                self.processed_img_label.configure(image=tk_processed_img)
-                self.processed_img_label.image = tk_processed_img
-
-                self.logger.debug("图像预览已更新")
-
-            except Exception as e:
-                self.logger.error(f"图像预览错误: {str(e)}")
+                    base = image
+
+            # 优先复用OCR引擎对原图的预处理结果（识别时已计算），预览与实际识别输入一致
+            processed_full = self.app.ocr_engine.cached_preprocessed(image)
+            if processed_full is None and is_scale_sensitive(settings_key):
+                # 自动阈值/Sauvola在缩小图上的结果与实际识别输入不同，须按原图计算后再缩小
+                # （不经过引擎，以免覆盖引擎缓存的结果）
+                processed_full = preprocess_with_params(image, settings_key)
+            if processed_full is None:
+                # 设置已变更、引擎尚无结果，且只有逐像素查找表：直接处理已缩小的预览图，
+                # 不为预览再遍历一遍全分辨率原图；不经过引擎，以免预览图覆盖引擎缓存的原图结果
+                processed_img = preprocess_with_params(base, settings_key)
+            elif processed_full.size == base.size:
+                processed_img = processed_full
+            else:
+                # 预处理预览只用于确认设置效果，用双线性缩放即可；Lanczos只留给原图预览
+                processed_img = processed_full.resize(base.size, Image.BILINEAR, reducing_gap=3.0)
+        except Exception as e:
+            self.logger.error(f"图像预览错误: {str(e)}")
+            # 仍需回到Tk线程清除进行中标记，否则同一设置的预览不会再重试
+            callback, args = self._preview_failed, (settings_key,)
         else:
-            self.logger.warning("没有可用的截图用于预览")
+            callback, args = self._install_preview_images, (image, settings_key, base, processed_img)
 
-    def preprocess_image(self, image):
-        """对图像进行预处理（与OCR引擎相同的处理）"""
-        # 灰度处理
-        if self.app.settings["preprocessing"]["grayscale"]:
-            image = image.convert('L')
+        try:
+            self.window.after(0, callback, *args)
+        except (RuntimeError, tk.TclError):
+            # 窗口已关闭
+            pass
 
-        # 反色处理
-        if self.app.settings["preprocessing"]["invert"]:
-            image = ImageOps.invert(image)
+    def _preview_failed(self, settings_key):
+        """Tk线程：预览生成失败，清除进行中标记以便下次重试"""
+        if self._preview_pending == settings_key:
+            self._preview_pending = None
+
+    def _install_preview_images(self, image, settings_key, base, processed_img):
+        """Tk线程：更新预览缓存并显示"""
+        if self._preview_pending == settings_key:
+            self._preview_pending = None
+        if image is not self._preview_source or not self.window.winfo_exists():
+            # 截图已更换或窗口已关闭，丢弃过期结果
+            return
 
-        # 二值化处理
-        threshold = self.app.settings["preprocessing"]["threshold"]
-        if threshold > 0:
-            image = image.point(lambda p: p > threshold and 255)
+        self._preview_base = base
+        self._preview_cache[settings_key] = processed_img
+        self._preview_cache.move_to_end(settings_key)
+        if len(self._preview_cache) > 4:
+            _, evicted = self._preview_cache.popitem(last=False)
+            self._photo_cache.pop(id(evicted), None)
 
-        # 增强对比度
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(1.5)
+        if not hasattr(self, 'original_img_label'):
+            # 预览标签页尚未创建，结果留在缓存中，首次打开时直接显示
+            return
 
-        return image
+        # 显示原始图像
+        self._show_preview(self.original_img_label, base)
+
+        # 显示预处理后的图像
+        self._show_preview(self.processed_img_label, processed_img)
+        self._preview_shown = settings_key
+
+        self.logger.debug("图像预览已更新")
+
+    def _show_preview(self, label, image):
+        """在标签上显示预览图，同一预览图的PhotoImage只创建和上传一次"""
+        # ImageTk通过Tk_PhotoPutBlock直接写入像素块（L/RGB无需转换），
+        # 比先编码PPM再base64交给Tk解析少一次编码和一次解码
+        entry = self._photo_cache.get(id(image))
+        if entry is None or entry[0] is not image:
+            # 同时保存PIL图像引用，防止id被回收后复用
+            entry = (image, ImageTk.PhotoImage(image))
+            self._photo_cache[id(image)] = entry
+        tk_img = entry[1]
+        if getattr(label, 'image', None) is not tk_img:
+            label.configure(image=tk_img)
+            label.image = tk_img
 
     def save_screenshot(self):
         """保存截图到文件"""
@@ -964,73 +1255,42 @@ class ResultWindow:
     def detect_language(self, text):
         """检测文本的主要语言"""
         self.logger.debug("检测文本语言")
-        # 简单的语言检测：检查中文字符比例
-        total_chars = len(text)
-        if total_chars == 0:
-            return "unknown"
-
-        # 统计中文字符数量
-        chinese_chars = sum(1 for char in text if '\u4e00' <= char <= '\u9fff')
-        chinese_ratio = chinese_chars / total_chars
+        return _detect_language(text)
 
-        # 如果中文字符超过30%，则认为是中文
-        if chinese_ratio > 0.3:
-            return "chinese"
-
-        # 检查其他语言特征
-        # 日文平假名和片假名
-        hiragana_chars = sum(1 for char in text if '\u3040' <= char <= '\u309f')
-        katakana_chars = sum(1 for char in text if '\u30a0' <= char <= '\u30ff')
-        japanese_ratio = (hiragana_chars + katakana_chars) / total_chars
-        
-        # 韩文
-        korean_chars = sum(1 for char in text if '\uac00' <= char <= '\ud7af')
-        korean_ratio = korean_chars / total_chars
-        
-        # 阿拉伯文
-        arabic_chars = sum(1 for char in text if '\u0600' <= char <= '\u06ff')
-        arabic_ratio = arabic_chars / total_chars
-        
-        # 俄文
-        cyrillic_chars = sum(1 for char in text if '\u0400' <= char <= '\u04ff')
-        cyrillic_ratio = cyrillic_chars / total_chars
-        
-        # 法文、德文、西班牙文等拉丁语系
-        latin_chars = sum(1 for char in text if '\u00c0' <= char <= '\u017f')
-        latin_ratio = latin_chars / total_chars
-        
-        # 英文单词
-        english_words = len(re.findall(r'\b[a-zA-Z]+\b', text))
-        
-        # 判断语言类型
-        if japanese_ratio > 0.1:
-            return "japanese"
-        elif korean_ratio > 0.1:
-            return "korean"
-        elif arabic_ratio > 0.1:
-            return "arabic"
-        elif cyrillic_ratio > 0.1:
-            return "russian"
-        elif latin_ratio > 0.1 or english_words > 0:
-            return "other_latin"  # 包括英文、法文、德文、西班牙文等
-        else:
-            return "unknown"
-
-        return "unknown"
+    def _network_status_fresh(self):
+        """是否有仍在有效期内的“网络可用”检测结果"""
+        return (_NET_STATUS["ok"] is True
+                and time.monotonic() - _NET_STATUS["ts"] < NET_STATUS_TTL)
 
     def check_network_connection(self):
-        """检查网络连接状态"""
+        """检查网络连接状态（连通结果缓存30秒）"""
+        if self._network_status_fresh():
+            return True
         self.logger.debug("检查网络连接")
         try:
-            # 尝试连接一个可靠的服务
-            socket.create_connection(("www.baidu.com", 80), timeout=5)
-            return True
+            # 尝试连接一个可靠的服务；超过1.5秒基本等同于不可用
+            with socket.create_connection(("www.baidu.com", 80), timeout=1.5):
+                ok = True
         except OSError:
             self.logger.warning("网络连接不可用")
-            return False
+            ok = False
+        _NET_STATUS["ok"] = ok
+        _NET_STATUS["ts"] = time.monotonic()
+        return ok
 
 
 
+    def _translate_after_probe(self, ok):
+        """网络探测完成后继续翻译"""
+        if not self.window.winfo_exists():
+            return
+        self.translate_btn.config(state=tk.NORMAL)
+        if not ok:
+            self.logger.error("尝试翻译但无网络连接")
+            messagebox.showerror("网络错误", "无法连接到互联网，请检查网络连接后重试")
+            return
+        self.translate_text()
+
     def append_to_translation_output(self, text):
         """向翻译输出框追加文本"""
         self.translate_output.config(state=tk.NORMAL)
@@ -1052,10 +1312,19 @@ class ResultWindow:
             messagebox.showerror("API密钥缺失", f"请先在设置中配置{provider_name} API密钥")
             return
 
-        # 检查网络连接
-        if not self.check_network_connection():
-            self.logger.error("尝试翻译但无网络连接")
-            messagebox.showerror("网络错误", "无法连接到互联网，请检查网络连接后重试")
+        # 检查网络连接：没有有效的连通结果时在后台探测，连通后重新进入本方法
+        if not self._network_status_fresh():
+            self.translate_btn.config(state=tk.DISABLED)
+
+            def probe():
+                ok = self.check_network_connection()
+                try:
+                    self.window.after(0, self._translate_after_probe, ok)
+                except (RuntimeError, tk.TclError):
+                    # 探测期间窗口已关闭
+                    pass
+
+            threading.Thread(target=probe, daemon=True).start()
             return
 
         # 获取要翻译的文本
@@ -1078,7 +1347,7 @@ class ResultWindow:
         self.translation_start_time = time.time()
 
         # 切换到翻译标签页
-        self.notebook.select(2)  # 切换到第三个标签页（翻译）
+        self._select_tab("translation")
 
         # 显示翻译中状态
         self.update_translation_output("翻译中，请稍候...")
@@ -1088,8 +1357,8 @@ class ResultWindow:
         target_lang = self.target_lang_var.get()
         
         # 获取语言代码
-        source_code = self.lang_code_mapping.get(source_lang, "auto")
-        target_code = self.lang_code_mapping.get(target_lang, "zh")
+        source_code = LANG_CODE_MAP.get(source_lang, "auto")
+        target_code = LANG_CODE_MAP.get(target_lang, "zh")
         
         # 如果是自动检测源语言，则检测文本语言
         if source_code == "auto":
@@ -1171,10 +1440,7 @@ class ResultWindow:
 
     def update_translation_output(self, text):
         """安全更新翻译结果框"""
-        self.translate_output.config(state=tk.NORMAL)
-        self.translate_output.delete(1.0, tk.END)
-        self.translate_output.insert(tk.END, text)
-        self.translate_output.config(state=tk.NORMAL)
+        self._set_text(self.translate_output, text, tk.NORMAL)
         self.translate_output.see(tk.END)
 
     def handle_translation_result(self, result):
@@ -1,8 +1,14 @@
 # screen_capture.py - 屏幕截图功能
 import tkinter as tk
-from PIL import ImageGrab
+from PIL import Image, ImageGrab
 import logging
 
+# 可选：MSS按区域直接截屏，避免ImageGrab每次抓取整屏再裁剪
+try:
+    import mss
+except ImportError:
+    mss = None
+
 class ScreenCapture:
     """处理屏幕截图相关功能的类"""
 
@@ -17,6 +23,9 @@ class ScreenCapture:
         self.virtual_width = virtual_width
         self.virtual_height = virtual_height
 
+        # 常驻的MSS实例，首次截图时创建，避免每次重新申请GDI资源
+        self._sct = None
+
         # 记录屏幕参数
         self.logger.info(f"屏幕参数: DPI缩放={dpi_scale:.2f}, 物理尺寸={screen_width}x{screen_height}, 虚拟尺寸={virtual_width}x{virtual_height}")
 
@@ -48,18 +57,46 @@ class ScreenCapture:
         """捕获指定区域的屏幕"""
         self.logger.info(f"捕获屏幕区域: {bbox}")
         try:
+            if mss is not None:
+                return self._grab_mss(bbox)
             # 尝试使用ImageGrab.grab捕获
             return ImageGrab.grab(bbox=bbox)
         except Exception as e:
-            self.logger.warning(f"ImageGrab.grab失败: {str(e)}, 使用备选方法")
-            # 备选截图方法: 捕获全屏然后裁剪
+            self.logger.warning(f"区域截图失败: {str(e)}, 使用备选方法")
+            # 备选截图方法: 只重试目标区域，不抓取整个桌面再裁剪
             try:
-                full_screen = ImageGrab.grab()
-                return full_screen.crop(bbox)
+                if mss is not None:
+                    # 常驻实例可能已失效（如显示器配置变化），换新实例重试
+                    self.close()
+                    return self._grab_mss(bbox)
+                # 仅当区域超出主显示器时才需要全部显示器的坐标系
+                return ImageGrab.grab(bbox=bbox, all_screens=self._outside_primary(bbox))
             except Exception as e2:
                 self.logger.error(f"备选截图方法失败: {str(e2)}")
                 raise Exception(f"无法捕获屏幕区域: {str(e2)}")
 
+    def _outside_primary(self, bbox):
+        """区域是否超出主显示器范围"""
+        x1, y1, x2, y2 = bbox
+        return x1 < 0 or y1 < 0 or x2 > self.screen_width or y2 > self.screen_height
+
+    def _grab_mss(self, bbox):
+        """使用常驻的MSS实例只截取目标区域"""
+        # MSS实例在区域尺寸不变时复用内部位图缓冲区；解码出的Image必须持有独立像素，
+        # 因为截图会被结果窗口、历史记录和后台保存引用，不能被下一次截图覆盖
+        if self._sct is None:
+            self._sct = mss.mss()
+        x1, y1, x2, y2 = bbox
+        shot = self._sct.grab({'left': x1, 'top': y1, 'width': x2 - x1, 'height': y2 - y1})
+        # 直接解码原始BGRA缓冲区并丢弃Alpha，避免先生成shot.rgb中间副本
+        return Image.frombuffer('RGB', shot.size, shot.bgra, 'raw', 'BGRX', 0, 1)
+
+    def close(self):
+        """释放截图资源"""
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
     def select_area(self, master):
         """使用鼠标选择截图区域"""
         self.logger.info("启动区域选择")
@@ -8,6 +8,10 @@ from typing import Dict, Any, Optional, List, Tuple
 import time
 from advanced_cache import AdvancedCache
 from error_handler import error_handler_decorator
+from ocr_engine import enhance_gray
+
+# 反色查找表：交给Image.point在C层完成，无需逐像素回调
+_INVERT_LUT = [255 - i for i in range(256)]
 
 class SmartOCREngine:
     """智能OCR引擎 - 自动优化识别参数和图像预处理"""
@@ -197,7 +201,8 @@ class SmartOCREngine:
                 elif step == "sharpen":
                     processed_image = self._sharpen_image(processed_image)
                 elif step == "invert":
-                    processed_image = ImageOps.invert(processed_image)
+                    processed_image = processed_image.point(
+                        _INVERT_LUT * len(processed_image.getbands()))
                 
                 self.logger.debug(f"应用预处理步骤: {step}")
                 
@@ -214,6 +219,9 @@ class SmartOCREngine:
     
     def _enhance_contrast(self, image: Image.Image) -> Image.Image:
         """增强对比度"""
+        if image.mode == 'L':
+            # 灰度图用一张查找表完成，省去ImageEnhance的均值图与blend
+            return enhance_gray(image, False, 0, 1.5)
         enhancer = ImageEnhance.Contrast(image)
         return enhancer.enhance(1.5)
     